@@ -0,0 +1,176 @@
+import pickle
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List
+
+
+def render_chunk_text(company_name: str, title: str, page_no: int, block_no_from: int, block_no_to: int, text: str) -> str:
+    """The company name / SourceRef header get_chunks puts around every chunk's text."""
+    return f"""
+        ---
+        company name: '{company_name}'
+        SourceRef: '{title}-Page: {page_no}-ispn-{page_no}-{block_no_from}-{block_no_to}-ispn'
+        text:
+        {text}
+        ---
+        """
+
+
+class Chunk:
+    """Lightweight view of one row of a ChunkStore."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: "ChunkStore", index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def title(self) -> str:
+        return self.store.titles[self.store.title_ids[self.index]]
+
+    @property
+    def page_no(self) -> int:
+        return self.store.page_nos[self.index]
+
+    @property
+    def block_no_from(self) -> int:
+        return self.store.block_nos_from[self.index]
+
+    @property
+    def block_no_to(self) -> int:
+        return self.store.block_nos_to[self.index]
+
+    @property
+    def text(self) -> str:
+        return self.store.text(self.index)
+
+    def render(self) -> str:
+        """Text with the company name / SourceRef header, as put into a prompt."""
+        return render_chunk_text(self.store.company_name, self.title, self.page_no,
+                                 self.block_no_from, self.block_no_to, self.text)
+
+    def to_dict(self, rendered: bool = True) -> Dict:
+        return {
+            'title': self.title,
+            'page_no': self.page_no,
+            'block_no_from': self.block_no_from,
+            'block_no_to': self.block_no_to,
+            'text': self.render() if rendered else self.text,
+        }
+
+
+class ChunkStore:
+    """
+    Compact, column-oriented chunk records for one document.
+
+    Texts live once in a shared, append-only buffer (a list of segments) and each
+    chunk stores (start, end) offsets into it; sentence chunks point inside their parent block instead of copying
+    it. Titles are interned, metadata columns are typed arrays, and the
+    company / SourceRef header is only rendered on demand (Chunk.render).
+
+    Parameters:
+    - company_name (str): Company name shown in rendered chunk headers
+    """
+
+    def __init__(self, company_name: str):
+        self.company_name = company_name
+        self.titles: List[str] = []
+        self._title_index: Dict[str, int] = {}
+        self.title_ids = array('I')
+        self.page_nos = array('I')
+        self.block_nos_from = array('i')
+        self.block_nos_to = array('i')
+        self.starts = array('Q')
+        self.ends = array('Q')
+        # Flushed text segments and their buffer offsets; pending parts are joined into
+        # one new segment on the next read, so no text is ever copied twice
+        self._segments: List[str] = []
+        self._segment_starts = array('Q')
+        self._parts: List[str] = []
+        self._flushed = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Chunk:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return Chunk(self, index % len(self))
+
+    def __iter__(self) -> Iterator[Chunk]:
+        return (Chunk(self, i) for i in range(len(self)))
+
+    def _append_buffer(self, text: str) -> int:
+        """Appends text to the shared buffer and returns its start offset."""
+        start = self._size
+        self._parts.append(text)
+        self._size += len(text)
+        return start
+
+    def _add_row(self, record: Dict, start: int, end: int):
+        title = record['title']
+        if title not in self._title_index:
+            self._title_index[title] = len(self.titles)
+            self.titles.append(title)
+        self.title_ids.append(self._title_index[title])
+        self.page_nos.append(record['page_no'])
+        self.block_nos_from.append(record['block_no_from'])
+        self.block_nos_to.append(record['block_no_to'])
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def add(self, record: Dict):
+        """Adds one chunk record (title, page_no, block_no_from, block_no_to, text)."""
+        start = self._append_buffer(record['text'])
+        self._add_row(record, start, start + len(record['text']))
+
+    def add_split(self, record: Dict, pieces: Iterable[str]):
+        """
+        Adds one chunk per piece of record['text'] (e.g. its sentences). The parent
+        text is stored once; pieces found in it are kept as offsets into it.
+        """
+        parent = record['text']
+        parent_start = self._append_buffer(parent)
+        cursor = 0
+        for piece in pieces:
+            pos = parent.find(piece, cursor)
+            if pos < 0:
+                # The splitter rewrote the piece; store it on its own
+                start = self._append_buffer(piece)
+            else:
+                start = parent_start + pos
+                cursor = pos + len(piece)
+            self._add_row(record, start, start + len(piece))
+
+    def _flush(self):
+        if self._parts:
+            self._segment_starts.append(self._flushed)
+            self._segments.append("".join(self._parts))
+            self._flushed = self._size
+            self._parts = []
+
+    def text(self, index: int) -> str:
+        self._flush()
+        start, end = self.starts[index], self.ends[index]
+        # A chunk never spans segments: it lies inside the one text it was appended with
+        segment = bisect_right(self._segment_starts, start) - 1
+        base = self._segment_starts[segment]
+        return self._segments[segment][start - base:end - base]
+
+    def to_records(self, rendered: bool = True) -> List[Dict]:
+        """Expands to the list-of-dicts format returned by get_chunks."""
+        return [chunk.to_dict(rendered) for chunk in self]
+
+    def save(self, path: str):
+        self._flush()
+        with open(path, "wb") as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "ChunkStore":
+        store = cls.__new__(cls)
+        with open(path, "rb") as f:
+            store.__dict__.update(pickle.load(f))
+        return store
@@ -1,97 +1,116 @@
-import fitz
 import re
 from PIL import Image
 import pytesseract
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Union
+from pdf_session import PdfSession, open_session
+from section_index import SectionIndex
+import date_scanner
+import layout_cache
+import ocr_pool
+import text_layer
+import llm_batch
 
-def extract_section_metadata_ocr_llm_title(pdf_path: str, toc: List[List], llm_pipeline: Callable) -> List[Dict]:
+
+def render_page(page, dpi: int = 300) -> Image.Image:
+    """Renders a page as an RGB PIL image."""
+    pix = page.get_pixmap(dpi=dpi)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+def ocr_page(page) -> str:
+    """Renders a page at 300 DPI and returns its tesseract text."""
+    return pytesseract.image_to_string(render_page(page))
+
+TITLE_PROMPT_VERSION = "title-v1"
+
+def title_prompt(page_text: str) -> str:
+    """LLM prompt asking for a section title from a start page's text."""
+    return (
+        "You are helping identify a meaningful section title from the start page of a company document.\n\n"
+        "From the following page text, extract a concise, human-readable title that best summarizes the section.\n\n"
+        "- If there is an explicit report name or heading (e.g. 'Back in Black - Reiterate OW'), use it.\n"
+        "- If it's a regulatory document like 'Form 6-K', use that and any company name near it.\n"
+        "- Ignore metadata, disclaimers, and footnotes.\n\n"
+        "Respond only in this format:\n\n"
+        "Title: <clean title>\n\n"
+        f"---\n{page_text}"
+    )
+
+def extract_section_metadata_ocr_llm_title(pdf_path: Union[str, PdfSession], toc: List[List], llm_pipeline: Callable, ocr_workers: int = None,
+                                           llm_batch_size: int = 8, llm_concurrency: int = 1, use_cache: bool = True) -> List[Dict]:
     """
     Uses OCR + LLM to extract the title from the first page of each section.
-    Uses regex to extract creation date from the OCR text.
+    Pages with a usable text layer skip OCR (see text_layer.OCR_STATS).
+    All title prompts go to the LLM together in batches (see llm_batch.generate_batch);
+    sections sharing a start page share one generation.
+    Uses regex to extract creation date from the page text.
     Calculates page_count from TOC entries.
 
     Parameters:
-    - pdf_path: path to the PDF
+    - pdf_path: path to the PDF, or an open PdfSession
     - toc: list of [level, section, start_page]
     - llm_pipeline: HuggingFace text-generation pipeline
+    - ocr_workers: OCR pool size (defaults to the CPU count)
+    - llm_batch_size: prompts per pipeline call
+    - llm_concurrency: batches in flight at once
+    - use_cache: reuse start-page text from layout_cache and LLM outputs from generation_cache
+      (False neither reads nor writes either cache)
 
     Returns:
     - List of dicts with metadata per section
     """
-    doc = fitz.open(pdf_path)
-    num_pages = len(doc)
-    enriched = []
-
-    # Date pattern for real dates (not 'Q1 2024')
-    date_pattern = re.compile(
-        r'('
-        r'\b\d{1,2}(st|nd|rd|th)?\s+\w+,\s+\d{4}\b|'     
-        r'\b\w+\s\d{1,2}(st|nd|rd|th)?,\s+\d{4}\b|'       
-        r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|'             
-        r'\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b|'               
-        r'\b\w+\s\d{1,2},\s\d{4}\b|'                      
-        r'\b\d{1,2}\s\w+\s\d{4}\b'                        
-        r')',
-        re.IGNORECASE
-    )
+    with open_session(pdf_path) as session:
+        if use_cache:
+            layout_cache.warm_session(session)  # OCR text of start pages from an earlier run
+        num_pages = len(session)
+        sections = SectionIndex(toc, num_pages)
+        enriched = []
 
-    for i, (level, section, start_page) in enumerate(toc):
-        start_idx = start_page - 1
-        page = doc[start_idx]
-
-        # --- OCR step ---
-        pix = page.get_pixmap(dpi=300)
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        ocr_text = pytesseract.image_to_string(img)
-        ocr_lines = [line.strip() for line in ocr_text.splitlines() if len(line.strip()) > 3]
-
-        # Use OCR output in LLM prompt
-        prompt = (
-            "You are helping identify a meaningful section title from the start page of a company document.\n\n"
-            "From the following page text, extract a concise, human-readable title that best summarizes the section.\n\n"
-            "- If there is an explicit report name or heading (e.g. 'Back in Black - Reiterate OW'), use it.\n"
-            "- If it's a regulatory document like 'Form 6-K', use that and any company name near it.\n"
-            "- Ignore metadata, disclaimers, and footnotes.\n\n"
-            "Respond only in this format:\n\n"
-            "Title: <clean title>\n\n"
-            f"---\n{ocr_text}"
+        # Start-page text: the PDF text layer when usable, otherwise OCR in one pooled batch (rendered lazily)
+        pending = sorted({start_page - 1 for _, _, start_page in toc if not session.has("start_text", start_page - 1)})
+        usable, needs_ocr = text_layer.route_pages({idx: session.page_text(idx) for idx in pending})
+        for idx, text in usable.items():
+            session.put("start_text", idx, text)
+        page_images = (render_page(session.page(idx)) for idx in needs_ocr)
+        for idx, text in zip(needs_ocr, ocr_pool.ocr_images(page_images, workers=ocr_workers, dpi=300)):
+            session.put("start_text", idx, text)
+
+        # --- Page text (text layer or OCR) and one batched LLM pass over all start pages ---
+        page_texts = [session.cached("start_text", start_page - 1, ocr_page) for _, _, start_page in toc]
+        results = llm_batch.generate_batch(
+            llm_pipeline, [title_prompt(page_text) for page_text in page_texts],
+            batch_size=llm_batch_size, concurrency=llm_concurrency, use_cache=use_cache,
+            template_version=TITLE_PROMPT_VERSION,
+            max_new_tokens=128, temperature=0.75, do_sample=False,
         )
 
-        try:
-            output = llm_pipeline(prompt, max_new_tokens=128, temperature=0.75, do_sample=False)
-            result = output[0]['generated_text']
-        except Exception as e:
-            print(f"[ERROR] LLM failed for section '{section}' (page {start_page}): {e}")
-            result = ""
-
-        # Parse title from LLM result
-        title = ""
-        for line in result.splitlines():
-            if line.lower().startswith("title:"):
-                title = line.split(":", 1)[-1].strip()
-
-        # Regex search for date from OCR text
-        top_text = " ".join(ocr_lines[:20])
-        top_text = re.sub(r"\s+", " ", top_text).strip()
-        date_match = date_pattern.search(top_text)
-        creation_date = date_match.group(0) if date_match else ""
-
-        # Compute page_count
-        end_idx = num_pages - 1
-        for j in range(i + 1, len(toc)):
-            next_start = toc[j][2] - 1
-            if next_start > start_idx:
-                end_idx = next_start - 1
-                break
-        page_count = max(1, end_idx - start_idx + 1)
-
-        enriched.append({
-            "level": level,
-            "section": section,
-            "page_start": start_page,
-            "page_count": page_count,
-            "title": title,
-            "creation_date": creation_date
-        })
-
-    return enriched
+        for i, (level, section, start_page) in enumerate(toc):
+            page_text, result = page_texts[i], results[i]
+            page_lines = [line.strip() for line in page_text.splitlines() if len(line.strip()) > 3]
+
+            # Parse title from LLM result
+            title = ""
+            for line in result.splitlines():
+                if line.lower().startswith("title:"):
+                    title = line.split(":", 1)[-1].strip()
+
+            # Regex search for date from page text
+            top_text = " ".join(page_lines[:20])
+            top_text = re.sub(r"\s+", " ", top_text).strip()
+            date_match = date_scanner.find_date(top_text)
+            creation_date = date_match.text if date_match else ""
+
+            # Compute page_count
+            page_count = max(1, sections.page_count(i, strict=True))
+
+            enriched.append({
+                "level": level,
+                "section": section,
+                "page_start": start_page,
+                "page_count": page_count,
+                "title": title,
+                "creation_date": creation_date
+            })
+
+        if use_cache:
+            layout_cache.persist_session(session)
+        return enriched
@@ -0,0 +1,84 @@
+import re
+from datetime import date
+from typing import Iterator, NamedTuple, Optional
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+
+# One alternation, so a page is scanned once and the leftmost date wins. Numeric dates
+# repeat one separator; dotted dates need a 4-digit year, so section/version numbers
+# ("1.2.24") are not dates.
+_FULL_DATE = (
+    rf"(?P<d1>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<m1>{_MONTH}),?\s+(?P<y1>\d{{4}})"      # 3rd August, 2025 / 23 April 2024
+    rf"|(?P<m2>{_MONTH})\s+(?P<d2>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<y2>\d{{4}})"     # April 23, 2024 / August 3rd, 2025
+    r"|(?P<y3>\d{4})[/-](?P<m3>\d{1,2})[/-](?P<d3>\d{1,2})"                           # 2024-04-23
+    r"|(?P<a4>\d{1,2})(?:(?P<s4>[/-])(?P<b4>\d{1,2})(?P=s4)(?P<y4>\d{4}|\d{2})"       # 23/04/2024, 04/23/24
+    r"|\.(?P<b6>\d{1,2})\.(?P<y6>\d{4}))"                                            # 23.04.2024 (not 1.2.24)
+)
+_MONTH_YEAR = rf"(?P<m5>{_MONTH})\s+(?P<y5>\d{{4}})"                                     # April 2024
+
+FULL_DATE_PATTERN = re.compile(rf"\b(?:{_FULL_DATE})\b", re.IGNORECASE)
+# At the same position, full dates are tried before month-year
+DATE_PATTERN = re.compile(rf"\b(?:{_FULL_DATE}|{_MONTH_YEAR})\b", re.IGNORECASE)
+
+
+class DateMatch(NamedTuple):
+    text: str   # as written on the page
+    iso: str    # "YYYY-MM-DD", or "YYYY-MM" for month-year dates
+    start: int  # offset in the scanned text
+
+
+def _month(name: str) -> int:
+    name = name.lower().rstrip(".")
+    return _MONTHS.get(name[:4] if name.startswith("sept") else name[:3], 0)
+
+
+def _iso(year: int, month: int, day: Optional[int]) -> Optional[str]:
+    try:
+        date(year, month, day or 1)
+    except ValueError:
+        return None
+    return f"{year:04d}-{month:02d}" if day is None else f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _normalize(match: re.Match, dayfirst: bool) -> Optional[str]:
+    g = match.group
+    if g("y1"):
+        return _iso(int(g("y1")), _month(g("m1")), int(g("d1")))
+    if g("y2"):
+        return _iso(int(g("y2")), _month(g("m2")), int(g("d2")))
+    if g("y3"):
+        return _iso(int(g("y3")), int(g("m3")), int(g("d3")))
+    if g("y4") or g("y6"):
+        a, b, year = int(g("a4")), int(g("b4") or g("b6")), int(g("y4") or g("y6"))
+        year += 2000 if year < 100 else 0
+        day, month = (a, b) if dayfirst else (b, a)
+        if month > 12 and day <= 12:  # 04/23/2024 can only be month-first
+            day, month = month, day
+        return _iso(year, month, day)
+    return _iso(int(g("y5")), _month(g("m5")), None)
+
+
+def iter_dates(text: str, dayfirst: bool = True, allow_month_year: bool = False) -> Iterator[DateMatch]:
+    """
+    Yields every valid date in the text, left to right, normalized to ISO.
+
+    Numeric dates are read day-first unless `dayfirst` is False or only the
+    month-first reading is valid; impossible dates (31/02/2024) are skipped.
+    Bare month-year ("March 2024") is only a date with `allow_month_year`: it is
+    usually a reporting period, not the document date.
+    """
+    pattern = DATE_PATTERN if allow_month_year else FULL_DATE_PATTERN
+    for match in pattern.finditer(text):
+        iso = _normalize(match, dayfirst)
+        if iso:
+            yield DateMatch(match.group(0), iso, match.start())
+
+
+def find_date(text: str, dayfirst: bool = True, allow_month_year: bool = False) -> Optional[DateMatch]:
+    """First valid date in the text, or None."""
+    return next(iter_dates(text, dayfirst, allow_month_year), None)
@@ -1,12 +1,9 @@
-import fitz  # PyMuPDF
+from link_index import get_link_index
 
 def get_page_numbers_from_links(pdf_path, toc_page):
     """Extracts page numbers from hyperlinks on the ToC page."""
-    doc = fitz.open(pdf_path)
-    links = doc[toc_page].get_links()
-    
-    # Extract page numbers from valid links
-    page_numbers = sorted([int(link["page"]) + 1 for link in links if "page" in link])  # Convert to 1-based indexing
+    # Extract page numbers from valid links (1-based)
+    page_numbers = sorted(get_link_index(pdf_path).targets_from(toc_page, one_based=True))
 
     print("\n🔹 Extracted Page Numbers from Links:", page_numbers)  # Debugging
     return page_numbers
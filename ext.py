@@ -1,21 +1,26 @@
 from langchain.document_loaders import UnstructuredMarkdownLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
 from langchain.chains import RetrievalQA
 from langchain.llms import HuggingFacePipeline
+from embedding_cache import CachedEmbeddings
+from vector_store import load_or_build_faiss
 
 # Step 1: Load Markdown File
-loader = UnstructuredMarkdownLoader("input.md")
-docs = loader.load()
+markdown_path = "input.md"
+chunk_params = {"chunk_size": 500, "chunk_overlap": 100}
 
-# Step 2: Chunk Text
-splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-chunks = splitter.split_documents(docs)
+def load_chunks():
+    loader = UnstructuredMarkdownLoader(markdown_path)
+    docs = loader.load()
 
-# Step 3: Embed Text
-embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
-vector_store = FAISS.from_documents(chunks, embedding_model)
+    # Step 2: Chunk Text
+    splitter = RecursiveCharacterTextSplitter(**chunk_params)
+    return splitter.split_documents(docs)
+
+# Step 3: Embed Text (reloaded from disk when this file was already embedded)
+embedding_model = CachedEmbeddings(HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2"))
+vector_store = load_or_build_faiss(markdown_path, load_chunks, embedding_model, chunk_params)
 
 # Step 4: Create a RAG Chain
 retriever = vector_store.as_retriever()
@@ -0,0 +1,92 @@
+import fitz  # PyMuPDF
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pdf_session import PdfSession
+
+
+def _title_above_table(page: fitz.Page, table_bbox: Tuple) -> Optional[str]:
+    """First line starting with 'Table' in the top 5 lines of text above the table."""
+    title_text = page.get_text("text", clip=fitz.Rect(0, 0, page.rect.width, table_bbox[1]))
+    if not title_text.strip():
+        return ""
+    lines = title_text.split('\n')[:5]
+    return next((line.strip() for line in lines if line.startswith("Table")), None)
+
+
+def _rows_to_records(rows: List[List]) -> List[Dict]:
+    """First row as header, remaining rows as dicts (None cells become "")."""
+    header = rows[0]
+    return [
+        {header[i]: (row[i] if i < len(row) and row[i] is not None else "") for i in range(len(header))}
+        for row in rows[1:]
+    ]
+
+
+def parse_page_content(page: fitz.Page) -> Dict:
+    """
+    Parses a page once for both text blocks and tables.
+
+    Table detection runs a single time; its result supplies the bbox, the
+    title-above-table and the cell data.
+
+    Returns:
+    - Dict: {"blocks": [(x0, y0, x1, y1, text, block_no, block_type), ...],
+             "tables": [{"bbox", "table_index", "title", "data"}, ...]}
+    """
+    blocks = [blk for blk in page.get_text("blocks") if blk[6] == 0]  # text blocks only
+    tables = []
+    for table_index, table in enumerate(page.find_tables().tables):
+        rows = table.extract()
+        if not rows or len(rows) <= 1:  # Skip empty or invalid tables
+            continue
+        tables.append({
+            "bbox": tuple(table.bbox),
+            "table_index": table_index + 1,
+            "title": _title_above_table(page, table.bbox),
+            "data": _rows_to_records(rows),
+        })
+    return {"blocks": blocks, "tables": tables}
+
+
+def _overlaps_table(blk: Tuple, table_bboxes: List[Tuple], min_overlap: float = 0.5) -> bool:
+    """True if at least `min_overlap` of the block's area lies inside one of the tables."""
+    rect = fitz.Rect(blk[:4])
+    if rect.is_empty:
+        return False
+    for bbox in table_bboxes:
+        inter = rect & fitz.Rect(bbox)
+        if not inter.is_empty and inter.get_area() >= min_overlap * rect.get_area():
+            return True
+    return False
+
+
+def page_content(session: PdfSession, page_no: int, suppress_table_text: bool = True) -> Dict:
+    """
+    Text blocks and tables for a 0-based page, parsed once per session.
+
+    Parameters:
+    - session (PdfSession): Open document session
+    - page_no (int): 0-based page index
+    - suppress_table_text (bool): Drop text blocks that mostly overlap a detected table,
+      so table content is not indexed twice
+
+    Returns:
+    - Dict: {"blocks": [...], "tables": [table_info, ...]} where table_info follows the
+      extract_tables_from_file schema (page_number, table_index, title, data) plus "bbox"
+    """
+    content = session.cached("content", page_no, parse_page_content)
+    tables = [dict(table, page_number=page_no + 1) for table in content["tables"]]
+    blocks = content["blocks"]
+    if suppress_table_text and tables:
+        bboxes = [table["bbox"] for table in tables]
+        blocks = [blk for blk in blocks if not _overlaps_table(blk, bboxes)]
+    return {"blocks": blocks, "tables": tables}
+
+
+def iter_document_content(session: PdfSession, suppress_table_text: bool = True) -> Iterator[Tuple[int, List, List[Dict]]]:
+    """
+    Walks the document once, yielding (page_no, text_blocks, tables) per page (0-based page_no).
+    """
+    for page_no in range(len(session)):
+        content = page_content(session, page_no, suppress_table_text)
+        yield page_no, content["blocks"], content["tables"]
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from text_cache import KeyedTextCache
+
+CACHE_DIR = os.environ.get(
+    "RESEA_LLM_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "resea", "llm"),
+)
+MAX_MEMORY_ENTRIES = 4096
+
+_cache = KeyedTextCache(CACHE_DIR, MAX_MEMORY_ENTRIES, "LLM")
+CACHE_STATS = _cache.stats  # memory_hit / disk_hit / miss
+
+
+def model_id(llm: Any) -> str:
+    """
+    Best-effort model identifier for a transformers pipeline, a LangChain LLM
+    wrapping one, or any callable.
+    """
+    for owner in (llm, getattr(llm, "pipeline", None)):
+        if owner is None:
+            continue
+        for attr in ("model_id", "model_name"):
+            if isinstance(getattr(owner, attr, None), str):
+                return getattr(owner, attr)
+        name = getattr(getattr(owner, "model", None), "name_or_path", None)
+        if name:
+            return name
+    return f"{type(llm).__module__}.{type(llm).__qualname__}"
+
+
+def normalize_input(text: str) -> str:
+    """Whitespace-insensitive form of an LLM input, so re-extracted text with different spacing still hits."""
+    return " ".join(text.split())
+
+
+def generation_key(model: str, template_version: str, text: str, params: Dict) -> str:
+    """
+    Cache key for one generation: model id, prompt template version, hash of the
+    normalized input and the generation parameters.
+
+    `template_version` names the prompt template the input was rendered with (each
+    caller keeps it in a *_PROMPT_VERSION constant). Bump it whenever the template
+    changes meaning, so outputs cached for the old prompt are no longer reused.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"model={model}|template={template_version}|".encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    digest.update(b"|input=")
+    digest.update(hashlib.sha256(normalize_input(text).encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Returns a cached generation (memory first, then disk), or None."""
+    return _cache.get(key)
+
+
+def put(key: str, text: str):
+    """Stores a generation in memory and on disk (atomic write)."""
+    _cache.put(key, text)
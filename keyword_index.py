@@ -0,0 +1,144 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+import layout_cache
+from pdf_session import PdfSession, open_session
+from section_index import SectionIndex
+
+_WORD = re.compile(r"\b[a-z]+\b")
+
+
+@lru_cache(maxsize=1)
+def english_stopwords() -> FrozenSet[str]:
+    """NLTK's English stopwords as a set, loaded once."""
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english"))
+
+
+class KeywordIndex:
+    """
+    Per-document keyword index: a sparse page x term count matrix built from one
+    tokenization pass, with smoothed IDF weights for TF-IDF ranking.
+
+    Tokens are lower-cased [a-z]+ words minus stopwords, the same tokenization as
+    extract_rece.get_top_keywords. Pages are 0-based.
+
+    Parameters:
+    - vocabulary (List[str]): Term of each matrix column
+    - counts (scipy.sparse.csr_matrix): (num_pages, num_terms) term counts, canonical format
+    - first_seen (np.ndarray): Per stored entry of `counts`, the rank of the term's first
+      occurrence on its page (breaks count ties the way Counter.most_common does)
+    """
+
+    def __init__(self, vocabulary: List[str], counts: sparse.csr_matrix, first_seen: np.ndarray):
+        self.vocabulary = vocabulary
+        self.counts = counts
+        self.first_seen = first_seen
+        num_pages = self.counts.shape[0]
+        doc_freq = np.bincount(self.counts.indices, minlength=len(vocabulary))
+        # Smoothed IDF (as in scikit-learn): log((1 + n) / (1 + df)) + 1
+        self.idf = np.log((1 + num_pages) / (1 + doc_freq)) + 1
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], stop_words: Optional[FrozenSet[str]] = None) -> "KeywordIndex":
+        stop_words = english_stopwords() if stop_words is None else stop_words
+        term_ids: Dict[str, int] = {}
+        indices: List[int] = []
+        data: List[int] = []
+        first_seen: List[int] = []
+        indptr = [0]
+        for text in texts:
+            page_counts = Counter(word for word in _WORD.findall(text.lower()) if word not in stop_words)
+            # Counter keeps first-occurrence order; store entries sorted by term id (canonical CSR)
+            entries = sorted((term_ids.setdefault(word, len(term_ids)), count, rank)
+                             for rank, (word, count) in enumerate(page_counts.items()))
+            for term_id, count, rank in entries:
+                indices.append(term_id)
+                data.append(count)
+                first_seen.append(rank)
+            indptr.append(len(indices))
+        counts = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(term_ids)),
+        )
+        return cls(list(term_ids), counts, np.asarray(first_seen, dtype=np.int32))
+
+    @classmethod
+    def from_session(cls, session: PdfSession, stop_words: Optional[FrozenSet[str]] = None) -> "KeywordIndex":
+        return cls.from_texts((session.page_text(p) for p in range(len(session))), stop_words)
+
+    def _top(self, terms: np.ndarray, scores: np.ndarray, ties: np.ndarray, top_n: int) -> List[Tuple[str, float]]:
+        """Top-n terms by score (ties broken by ascending `ties`), without sorting the whole row."""
+        if not len(terms):
+            return []
+        if top_n < len(terms):
+            # Keep every entry scoring at least the n-th best so ties are resolved below
+            cutoff = -np.partition(-scores, top_n - 1)[top_n - 1]
+            keep = scores >= cutoff
+            terms, scores, ties = terms[keep], scores[keep], ties[keep]
+        order = np.lexsort((ties, -scores))[:top_n]
+        return [(self.vocabulary[t], float(s)) for t, s in zip(terms[order], scores[order])]
+
+    def _page_entries(self, page_no: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Out-of-range pages (e.g. GoToR link targets, which carry the remote file's page) have no terms
+        if not 0 <= page_no < self.counts.shape[0]:
+            return self.counts.indices[:0], self.counts.data[:0], self.first_seen[:0]
+        lo, hi = self.counts.indptr[page_no], self.counts.indptr[page_no + 1]
+        return self.counts.indices[lo:hi], self.counts.data[lo:hi], self.first_seen[lo:hi]
+
+    def page_keywords(self, page_no: int, top_n: int = 10) -> List[Tuple[str, float]]:
+        """Top-n (term, tf-idf) for a page ([] for pages outside the document)."""
+        terms, counts, ties = self._page_entries(page_no)
+        return self._top(terms, counts * self.idf[terms], ties, top_n)
+
+    def pages_keywords(self, pages: Iterable[int], top_n: int = 10) -> List[Tuple[str, float]]:
+        """Top-n (term, tf-idf) for a set of pages taken together (e.g. a section)."""
+        pages = [p for p in pages if 0 <= p < self.counts.shape[0]]
+        if not pages:
+            return []
+        summed = sparse.csr_matrix(self.counts[pages].sum(axis=0))
+        terms = summed.indices
+        return self._top(terms, summed.data * self.idf[terms], terms, top_n)
+
+    def page_term_counts(self, page_no: int, top_n: int = 10) -> List[Tuple[str, int]]:
+        """
+        Top-n raw (term, count) for a page, ordered exactly like get_top_keywords;
+        [] for pages outside the document, as extract_text_from_page returned "".
+        """
+        terms, counts, ties = self._page_entries(page_no)
+        return [(term, int(count)) for term, count in self._top(terms, counts, ties, top_n)]
+
+    def section_keywords(self, toc: List[List], top_n: int = 10, strict: bool = True) -> List[Dict]:
+        """
+        Top-n keywords per TOC section, over the section's page range.
+
+        Returns:
+        - List[Dict]: {"title", "level", "pages": (first, last) 1-based, "keywords": [(term, tf-idf), ...]}
+        """
+        sections = SectionIndex(toc, self.counts.shape[0])
+        results = []
+        for i in range(len(sections)):
+            first, last = sections.page_range(i, strict)
+            results.append({
+                "title": sections.title(i),
+                "level": sections.level(i),
+                "pages": (first, last),
+                "keywords": self.pages_keywords(range(first - 1, last), top_n),
+            })
+        return results
+
+
+def get_keyword_index(pdf: Union[str, PdfSession], use_cache: bool = True,
+                      cache_dir: Optional[str] = None) -> KeywordIndex:
+    """
+    Returns the document's KeywordIndex (layout cache kind "keywords"), see
+    layout_cache.cached_document_view. A path opens a session that is closed
+    before returning.
+    """
+    with open_session(pdf) as session:
+        return layout_cache.cached_document_view(session, "keywords", KeywordIndex.from_session, use_cache, cache_dir)
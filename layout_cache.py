@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import os
+import pickle
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Bump whenever a parser/extractor change alters what gets cached; old entries are then ignored.
+EXTRACTOR_VERSION = 2
+
+# Payload schema version per cached kind, part of every entry name: bump a kind's
+# version when its payload changes (a new session view, new table fields, ...) so
+# entries written by older code are ignored without invalidating the other kinds.
+KIND_VERSIONS: Dict[str, int] = {
+    "session": 1,        # PdfSession.snapshot(): page views incl. start_text, dnd, page_blocks
+    "tables": 1,         # table_extract.extract_tables_from_file
+    "ocr_tables": 1,     # lu_bask.extract_tables_and_text
+    "ocr_tables_c2f": 1,
+    "links": 1,          # link_index.LinkIndex
+    "keywords": 1,       # keyword_index.KeywordIndex
+}
+
+# Entries are pickles, and unpickling runs code: CACHE_DIR must be a trusted,
+# private directory (never a location other users or uploads can write to).
+CACHE_DIR = os.environ.get(
+    "RESEA_LAYOUT_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "resea", "layout"),
+)
+
+# Page number under which whole-document views (indexes over every page) are memoized in a PdfSession
+DOCUMENT = -1
+
+# (path, size, mtime) -> sha256, so one ingest hashes each file only once
+_sha_memo: Dict[Tuple[str, int, float], str] = {}
+
+
+def file_sha256(path: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    if memo_key not in _sha_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _sha_memo[memo_key] = digest.hexdigest()
+    return _sha_memo[memo_key]
+
+
+def _entry_path(pdf_path: str, kind: str, cache_dir: Optional[str]) -> str:
+    name = f"{file_sha256(pdf_path)}-v{EXTRACTOR_VERSION}.{KIND_VERSIONS.get(kind, 1)}-{kind}.bin"
+    return os.path.join(cache_dir or CACHE_DIR, name)
+
+
+def load_layout(pdf_path: str, kind: str, cache_dir: Optional[str] = None) -> Optional[Any]:
+    """
+    Loads a cached layout entry (e.g. "session", "tables", "ocr_tables") for a PDF.
+
+    Returns:
+    - The cached value, or None on a miss or unreadable entry
+    """
+    entry = _entry_path(pdf_path, kind, cache_dir)
+    if not os.path.exists(entry):
+        return None
+    try:
+        with open(entry, "rb") as f:
+            return pickle.loads(zlib.decompress(f.read()))
+    except Exception:
+        logging.warning(f"Ignoring unreadable layout cache entry {entry}", exc_info=True)
+        return None
+
+
+def save_layout(pdf_path: str, kind: str, value: Any, cache_dir: Optional[str] = None):
+    """
+    Stores a layout entry as zlib-compressed pickle; the write is atomic so
+    concurrent ingests of the same PDF never see a partial file.
+    """
+    entry = _entry_path(pdf_path, kind, cache_dir)
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    tmp = f"{entry}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+    os.replace(tmp, entry)
+
+
+def cached_layout(pdf_path: str, kind: str, compute: Callable[[], Any], cache_dir: Optional[str] = None) -> Any:
+    """Returns the cached entry for (pdf, kind), computing and storing it on a miss."""
+    value = load_layout(pdf_path, kind, cache_dir)
+    if value is None:
+        value = compute()
+        save_layout(pdf_path, kind, value, cache_dir)
+    return value
+
+
+def warm_session(session, cache_dir: Optional[str] = None) -> bool:
+    """
+    Preloads a PdfSession with the page views persisted by a previous ingest.
+
+    Returns:
+    - bool: True on a cache hit
+    """
+    snapshot = load_layout(session.pdf_path, "session", cache_dir)
+    if snapshot is None:
+        return False
+    session.restore(snapshot)
+    return True
+
+
+def persist_session(session, cache_dir: Optional[str] = None):
+    """Persists every page view the session has parsed so far (no-op if nothing new was parsed)."""
+    if not session.dirty:
+        return
+    save_layout(session.pdf_path, "session", session.snapshot(), cache_dir)
+    session.dirty = False
+
+
+def cached_document_view(session, kind: str, build: Callable[[Any], Any], use_cache: bool = True,
+                         cache_dir: Optional[str] = None) -> Any:
+    """
+    Returns build(session), a view over the whole document (e.g. a link or keyword
+    index), built at most once per session and, with use_cache, at most once per
+    PDF content (layout cache entry `kind` in `cache_dir`).
+
+    Parameters:
+    - session (PdfSession): The ingest's open session, shared by every view
+    - kind (str): Cache entry kind, see KIND_VERSIONS
+    - build (Callable): Builds the view from the session on a miss
+    """
+    if not session.has(kind, DOCUMENT):
+        if use_cache:
+            view = cached_layout(session.pdf_path, kind, lambda: build(session), cache_dir)
+        else:
+            view = build(session)
+        session.put(kind, DOCUMENT, view)
+    return session.get(kind, DOCUMENT)
@@ -0,0 +1,99 @@
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+import layout_cache
+from pdf_session import PdfSession, open_session
+
+
+class LinkIndex:
+    """
+    Document-wide internal-link graph, built from one get_links() pass per page.
+
+    Links are stored as NumPy columns (source page, target page, rect), ordered by
+    source page and then by the page's own link order, with per-page slices for
+    source lookups and a bincount of inbound links per target page. All page
+    numbers are 0-based unless a method says otherwise.
+
+    Parameters:
+    - num_pages (int): Page count of the document
+    - sources, targets (List[int]): Source / target page of each internal link
+    - rects (List[tuple]): (x0, y0, x1, y1) of each internal link's hot area
+    - links_per_page (List[int]): Count of all links (internal and external) per page
+    """
+
+    def __init__(self, num_pages: int, sources: List[int], targets: List[int], rects: List[tuple],
+                 links_per_page: List[int]):
+        self.num_pages = num_pages
+        self.sources = np.asarray(sources, dtype=np.int32)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.rects = np.asarray(rects, dtype=np.float32).reshape(-1, 4)
+        self.links_per_page = np.asarray(links_per_page, dtype=np.int32)
+        self.inbound = np.bincount(self.targets[self.targets >= 0], minlength=num_pages)
+        # Sources are ascending, so each page's outbound links are one [lo, hi) slice
+        self._bounds = np.searchsorted(self.sources, np.arange(num_pages + 1))
+
+    @classmethod
+    def from_session(cls, session: PdfSession) -> "LinkIndex":
+        sources, targets, rects, links_per_page = [], [], [], []
+        for page_no in range(len(session)):
+            links = session.page_links(page_no)
+            links_per_page.append(len(links))
+            for link in links:
+                if "page" not in link:
+                    continue
+                try:
+                    target = int(link["page"])
+                except (ValueError, TypeError):
+                    continue  # Ignore non-integer page references
+                rect = link.get("from")
+                sources.append(page_no)
+                targets.append(target)
+                rects.append(tuple(rect) if rect is not None else (0, 0, 0, 0))
+        return cls(len(session), sources, targets, rects, links_per_page)
+
+    def _slice(self, page_no: int) -> slice:
+        return slice(self._bounds[page_no], self._bounds[page_no + 1])
+
+    def targets_from(self, page_no: int, one_based: bool = False) -> List[int]:
+        """Target pages of a page's internal links, in link order."""
+        targets = self.targets[self._slice(page_no)]
+        return (targets + int(one_based)).tolist()
+
+    def rects_from(self, page_no: int) -> np.ndarray:
+        """(n, 4) hot-area rects of a page's internal links, aligned with targets_from."""
+        return self.rects[self._slice(page_no)]
+
+    def toc_page(self, max_pages: int = 3) -> int:
+        """Among the first `max_pages` pages, the one with the most links (first page if none)."""
+        counts = self.links_per_page[:max_pages]
+        return int(np.argmax(counts)) if len(counts) and counts.max() > 0 else 0
+
+    def inbound_count(self, page_no: int) -> int:
+        return int(self.inbound[page_no]) if 0 <= page_no < len(self.inbound) else 0
+
+    def most_linked(self, n: int = 10) -> List[int]:
+        """Up to n pages with the most inbound links, most-linked first (ties by page order)."""
+        order = np.argsort(-self.inbound, kind="stable")[:n]
+        return [int(p) for p in order if self.inbound[p] > 0]
+
+    def link_map(self) -> Dict[int, List[int]]:
+        """
+        {target page (0-based, page 0 excluded): [1-based source pages, ...]}, the
+        shape returned by extract_rece.extract_hyperlinks.
+        """
+        link_map: Dict[int, List[int]] = {}
+        for source, target in zip(self.sources.tolist(), self.targets.tolist()):
+            if target > 0:
+                link_map.setdefault(target, []).append(source + 1)
+        return link_map
+
+
+def get_link_index(pdf: Union[str, PdfSession], use_cache: bool = True,
+                   cache_dir: Optional[str] = None) -> LinkIndex:
+    """
+    Returns the document's LinkIndex (layout cache kind "links"), see
+    layout_cache.cached_document_view. A path opens a session that is closed
+    before returning.
+    """
+    with open_session(pdf) as session:
+        return layout_cache.cached_document_view(session, "links", LinkIndex.from_session, use_cache, cache_dir)
@@ -0,0 +1,151 @@
+import json
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import generation_cache
+
+LLM_STATS = Counter()  # generated / retry / failed (cache hits: generation_cache.CACHE_STATS)
+
+
+def _generated_text(output) -> str:
+    # The pipeline returns [{"generated_text": ...}] per prompt
+    if isinstance(output, list):
+        output = output[0] if output else {}
+    return output.get("generated_text", "") if isinstance(output, dict) else str(output)
+
+
+def _call_with_retries(call: Callable[[], list], retries: int, backoff: float, what: str) -> Optional[list]:
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == retries:
+                logging.warning(f"LLM call failed for {what} after {retries + 1} attempts: {e}")
+                return None
+            LLM_STATS["retry"] += 1
+            time.sleep(backoff * 2 ** attempt)
+
+
+def _run_cached(keys: Sequence[str], items: Sequence[Any], run_batch: Callable[[List[Any]], List[Optional[str]]],
+                batch_size: int, concurrency: int, use_cache: bool) -> List[Optional[str]]:
+    """
+    Shared driver: serves cached keys, runs each distinct missing item once in
+    batches (up to `concurrency` at a time) and caches successful outputs.
+    """
+    results: Dict[str, Optional[str]] = {}
+    todo: Dict[str, Any] = {}  # key -> item, deduplicated, in first-seen order
+    for key, item in zip(keys, items):
+        if key in results or key in todo:
+            continue
+        cached = generation_cache.get(key) if use_cache else None
+        if cached is not None:
+            results[key] = cached
+        else:
+            todo[key] = item
+
+    pending = list(todo.items())
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    def run(batch):
+        return run_batch([item for _, item in batch])
+
+    if concurrency > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            batch_outputs = list(pool.map(run, batches))
+    else:
+        batch_outputs = [run(batch) for batch in batches]
+
+    for batch, outputs in zip(batches, batch_outputs):
+        for (key, _), text in zip(batch, outputs):
+            results[key] = text
+            LLM_STATS["generated"] += 1
+            if use_cache and text:
+                generation_cache.put(key, text)
+
+    logging.info(f"LLM batch: {len(keys)} inputs, {len(pending)} generated in {len(batches)} batches.")
+    return [results[key] for key in keys]
+
+
+def generate_batch(llm_pipeline: Callable, prompts: List[str], batch_size: int = 8, concurrency: int = 1,
+                   retries: int = 2, backoff: float = 1.0, use_cache: bool = True, template_version: str = "",
+                   **gen_kwargs) -> List[str]:
+    """
+    Runs many prompts through a HuggingFace text-generation pipeline in batches.
+
+    Identical prompts are generated once, and with use_cache results come from
+    generation_cache, keyed by model id, `template_version`, the normalized prompt
+    and the generation parameters. Failed batches are retried with exponential
+    backoff, then retried prompt by prompt; a prompt that still fails yields "".
+
+    Parameters:
+    - llm_pipeline (Callable): Pipeline accepting a list of prompts and `batch_size`
+    - prompts (List[str]): Prompts to generate for
+    - batch_size (int): Prompts per pipeline call
+    - concurrency (int): Batches in flight at once (>1 only helps remote/served models)
+    - retries (int): Extra attempts per failed call
+    - template_version (str): Prompt template version, see generation_cache.generation_key
+    - gen_kwargs: Passed to the pipeline (max_new_tokens, temperature, ...)
+
+    Returns:
+    - List[str]: generated_text per prompt, in input order
+    """
+    model = generation_cache.model_id(llm_pipeline)
+    keys = [generation_cache.generation_key(model, template_version, prompt, gen_kwargs) for prompt in prompts]
+
+    def run_batch(batch: List[str]) -> List[str]:
+        outputs = _call_with_retries(lambda: llm_pipeline(batch, batch_size=len(batch), **gen_kwargs),
+                                     retries, backoff, f"a batch of {len(batch)} prompts")
+        if outputs is not None and len(outputs) == len(batch):
+            return [_generated_text(output) for output in outputs]
+
+        # Batch failed: isolate the failing prompt(s) by running them one by one
+        results = []
+        for prompt in batch:
+            output = _call_with_retries(lambda: llm_pipeline(prompt, **gen_kwargs), retries, backoff, "one prompt")
+            if output is None:
+                LLM_STATS["failed"] += 1
+            results.append(_generated_text(output) if output is not None else "")
+        return results
+
+    return _run_cached(keys, prompts, run_batch, batch_size, concurrency, use_cache)
+
+
+def apply_chain(chain, inputs: List[Dict], batch_size: int = 8, concurrency: int = 1, retries: int = 2,
+                backoff: float = 1.0, use_cache: bool = True, template_version: str = "") -> List[Optional[str]]:
+    """
+    Runs a LangChain LLMChain over many inputs with chain.apply, batch_size inputs
+    per call and up to `concurrency` calls in flight.
+
+    Cached like generate_batch (the chain's LLM as model id, its inputs as the
+    normalized input). A failed batch is retried with exponential backoff, then
+    input by input.
+
+    Parameters:
+    - chain: LLMChain (or anything with apply/output_key and an optional llm)
+    - inputs (List[Dict]): Input variables per call
+    - template_version (str): Prompt template version, see generation_cache.generation_key
+
+    Returns:
+    - List[Optional[str]]: The chain's output text per input, in input order (None if it failed)
+    """
+    llm = getattr(chain, "llm", chain)
+    model, params = generation_cache.model_id(llm), getattr(llm, "pipeline_kwargs", None) or {}
+    keys = [generation_cache.generation_key(model, template_version, json.dumps(item, sort_keys=True, default=str), params)
+            for item in inputs]
+
+    def run_batch(batch: List[Dict]) -> List[Optional[str]]:
+        outputs = _call_with_retries(lambda: chain.apply(batch), retries, backoff, f"a batch of {len(batch)} inputs")
+        if outputs is not None and len(outputs) == len(batch):
+            return [output[chain.output_key] for output in outputs]
+        results = []
+        for single in batch:
+            output = _call_with_retries(lambda: chain.apply([single]), retries, backoff, "one input")
+            if output is None:
+                LLM_STATS["failed"] += 1
+            results.append(output[0][chain.output_key] if output else None)
+        return results
+
+    return _run_cached(keys, inputs, run_batch, batch_size, concurrency, use_cache)
@@ -1,4 +1,15 @@
-def should_skip_page(markdown_text: str, min_words: int = 30, min_table_lines: int = 3) -> bool:
+# Page gate thresholds, shared with table_gate.likely_table
+MIN_WORDS = 30
+MIN_TABLE_LINES = 3
+
+
+def tableish_line_count(markdown_text: str) -> int:
+    """Lines with a digit and 2+ tokens."""
+    return sum(1 for line in markdown_text.splitlines()
+               if any(char.isdigit() for char in line) and len(line.split()) >= 2)
+
+
+def should_skip_page(markdown_text: str, min_words: int = MIN_WORDS, min_table_lines: int = MIN_TABLE_LINES) -> bool:
     # Trim and check word count
     word_count = len(markdown_text.strip().split())
     if word_count < min_words:
@@ -6,12 +17,9 @@ def should_skip_page(markdown_text: str, min_words: int = 30, min_table_lines: i
         return True
 
     # Check for table-like structure (at least N lines with numbers and 2+ tokens)
-    tableish_lines = [
-        line for line in markdown_text.splitlines()
-        if any(char.isdigit() for char in line) and len(line.split()) >= 2
-    ]
-    if len(tableish_lines) < min_table_lines:
-        print(f"⏭️ Skipping: not enough table-like lines ({len(tableish_lines)} found)")
+    tableish_lines = tableish_line_count(markdown_text)
+    if tableish_lines < min_table_lines:
+        print(f"⏭️ Skipping: not enough table-like lines ({tableish_lines} found)")
         return True
 
     return False
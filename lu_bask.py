@@ -1,35 +1,44 @@
 import cv2
-import pytesseract
 import logging
 import re
 import fitz  # PyMuPDF
 import numpy as np
-from typing import List, Tuple, Any
+import layout_cache
+import ocr_pool
+from typing import Iterator, List, Tuple, Any
 
-def pdf_to_images(pdf_path: str) -> List[Any]:
+def render_page_gray(page: fitz.Page, zoom: float = 2, clip: fitz.Rect = None) -> Any:
     """
-    Converts PDF pages to grayscale images using PyMuPDF.
+    Renders a single page (or the `clip` region of it) at `zoom` x resolution
+    as a grayscale image.
     """
-    try:
-        logging.info("Converting PDF to images.")
-        pdf_document = fitz.open(pdf_path)
-        images = []
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)  # Increase resolution
+    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+    return cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
 
-        for page_number in range(len(pdf_document)):
-            page = pdf_document[page_number]
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # Increase resolution
-            img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
-            gray_image = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-            images.append(gray_image)
-
-        pdf_document.close()
-        logging.info("PDF converted to images successfully.")
-        return images
+def iter_pdf_images(pdf_path: str) -> Iterator[Any]:
+    """
+    Yields grayscale page images one at a time, so only the page being
+    processed is held in memory.
+    """
+    try:
+        with fitz.open(pdf_path) as pdf_document:
+            for page in pdf_document:
+                yield render_page_gray(page)
 
     except Exception as e:
         logging.error("Error converting PDF to images", exc_info=True)
         raise
 
+def pdf_to_images(pdf_path: str) -> List[Any]:
+    """
+    Converts PDF pages to grayscale images using PyMuPDF.
+    """
+    logging.info("Converting PDF to images.")
+    images = list(iter_pdf_images(pdf_path))
+    logging.info("PDF converted to images successfully.")
+    return images
+
 def detect_tables(image: Any) -> List[Tuple[int, int, int, int]]:
     """
     Detects tables in an image using morphological transformations and contour detection.
@@ -57,15 +66,14 @@ def detect_tables(image: Any) -> List[Tuple[int, int, int, int]]:
         logging.error("Error during table detection", exc_info=True)
         raise
 
-def extract_text_from_tables(image: Any, tables: List[Tuple[int, int, int, int]]) -> List[str]:
+def extract_text_from_tables(image: Any, tables: List[Tuple[int, int, int, int]], workers: int = None) -> List[str]:
     """
     Extracts text from specified table regions in an image using OCR.
+    Regions are OCR'd in parallel on the shared OCR pool (results keep region order).
     """
     try:
-        texts = [
-            pytesseract.image_to_string(image[y:y + h, x:x + w], lang='eng')
-            for x, y, w, h in tables
-        ]
+        crops = [image[y:y + h, x:x + w] for x, y, w, h in tables]
+        texts = ocr_pool.ocr_images(crops, lang='eng', workers=workers, dpi=144)
         logging.info(f"Extracted text from {len(tables)} tables.")
         return texts
 
@@ -73,18 +81,61 @@ def extract_text_from_tables(image: Any, tables: List[Tuple[int, int, int, int]]
         logging.error("Error extracting text from tables", exc_info=True)
         raise
 
-def extract_tables_and_text(pdf_path: str) -> List[str]:
+def page_may_have_ruled_tables(page: fitz.Page, min_rule_lines: int = 4) -> bool:
+    """
+    Cheap vector-layer check: True if the page draws at least `min_rule_lines`
+    horizontal/vertical rules, or is mostly covered by a raster image (a scan,
+    where the vector layer says nothing about tables). Logos and charts don't count.
+    """
+    page_area = page.rect.get_area()
+    for info in page.get_image_info():
+        if fitz.Rect(info["bbox"]).get_area() >= 0.5 * page_area:
+            return True
+    rules = 0
+    for path in page.get_drawings():
+        for item in path["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                is_rule = abs(p1.y - p2.y) < 1 or abs(p1.x - p2.x) < 1
+            elif item[0] == "re":
+                rect = item[1]
+                is_rule = rect.height < 2 or rect.width < 2
+            else:
+                is_rule = False
+            if is_rule:
+                rules += 1
+                if rules >= min_rule_lines:
+                    return True
+    return False
+
+def detect_tables_coarse(page: fitz.Page, coarse_zoom: float = 1, pad: float = 2) -> List[fitz.Rect]:
+    """
+    Runs detect_tables on a cheap low-resolution render and returns the table
+    regions in PDF coordinates (padded, clipped to the page).
+    """
+    image = render_page_gray(page, zoom=coarse_zoom)
+    rects = []
+    for x, y, w, h in detect_tables(image):
+        rect = fitz.Rect(x / coarse_zoom - pad, y / coarse_zoom - pad,
+                         (x + w) / coarse_zoom + pad, (y + h) / coarse_zoom + pad)
+        rects.append(rect & page.rect)
+    return rects
+
+def extract_tables_and_text(pdf_path: str, use_cache: bool = True, coarse_to_fine: bool = False) -> List[str]:
     """
     Extracts tables and their respective text from the document specified by the given PDF path.
+    With use_cache, OCR results from an earlier ingest of the same PDF content are reused.
+    With coarse_to_fine, tables are located on low-resolution renders and only their
+    regions are rendered at full resolution (see iter_tables_and_text).
     """
+    if use_cache:
+        kind = "ocr_tables_c2f" if coarse_to_fine else "ocr_tables"
+        return layout_cache.cached_layout(pdf_path, kind, lambda: extract_tables_and_text(pdf_path, False, coarse_to_fine))
+
     try:
         logging.info("Starting table and text extraction process.")
-        images = pdf_to_images(pdf_path)
-
         all_tables_text = []
-        for image in images:
-            tables = detect_tables(image)
-            texts = extract_text_from_tables(image, tables)
+        for texts in iter_tables_and_text(pdf_path, coarse_to_fine):
             all_tables_text.extend(texts)
 
         logging.info("Completed table and text extraction process.")
@@ -94,6 +145,37 @@ def extract_tables_and_text(pdf_path: str) -> List[str]:
         logging.error("Error in extracting tables and text", exc_info=True)
         raise
 
+def iter_tables_and_text(pdf_path: str, coarse_to_fine: bool = False) -> Iterator[List[str]]:
+    """
+    Streaming variant of extract_tables_and_text: renders, table-detects and OCRs
+    one page at a time and yields that page's table texts before the next page
+    is rendered, keeping memory bounded to a single page image.
+
+    coarse_to_fine skips pages whose vector layer has no ruling lines, detects
+    grids on a 1x render, and renders only the detected regions at 2x for OCR.
+    """
+    if coarse_to_fine:
+        yield from _iter_tables_and_text_coarse(pdf_path)
+        return
+
+    for page_number, image in enumerate(iter_pdf_images(pdf_path)):
+        tables = detect_tables(image)
+        texts = extract_text_from_tables(image, tables)
+        logging.info(f"Page {page_number + 1}: OCR'd {len(texts)} table regions.")
+        del image  # release the page's pixels before rendering the next one
+        yield texts
+
+def _iter_tables_and_text_coarse(pdf_path: str) -> Iterator[List[str]]:
+    with fitz.open(pdf_path) as pdf_document:
+        for page in pdf_document:
+            if not page_may_have_ruled_tables(page):
+                yield []
+                continue
+            crops = [render_page_gray(page, zoom=2, clip=rect) for rect in detect_tables_coarse(page)]
+            texts = ocr_pool.ocr_images(crops, lang='eng', dpi=144)
+            logging.info(f"Page {page.number + 1}: OCR'd {len(texts)} table regions (coarse-to-fine).")
+            yield texts
+
 def extracted_data(pdf_path: str) -> List[str]:
     """
     Cleans and returns the extracted text data from tables in the document.
@@ -0,0 +1,42 @@
+import hashlib
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+from text_cache import KeyedTextCache
+
+CACHE_DIR = os.environ.get(
+    "RESEA_OCR_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "resea", "ocr"),
+)
+MAX_MEMORY_ENTRIES = 4096
+
+_cache = KeyedTextCache(CACHE_DIR, MAX_MEMORY_ENTRIES, "OCR")
+CACHE_STATS = _cache.stats  # memory_hit / disk_hit / miss
+
+
+def ocr_key(image: Any, dpi: Optional[int], lang: Optional[str], config: str) -> str:
+    """
+    Cache key for an OCR call: hash of the rendered pixels (region already cropped)
+    plus their shape/mode, the render DPI, the tesseract language and config.
+    """
+    digest = hashlib.sha256()
+    if isinstance(image, np.ndarray):
+        digest.update(f"nd:{image.shape}:{image.dtype}".encode())
+        digest.update(np.ascontiguousarray(image).tobytes())
+    else:  # PIL image
+        digest.update(f"pil:{image.size}:{image.mode}".encode())
+        digest.update(image.tobytes())
+    digest.update(f"|dpi={dpi}|lang={lang}|config={config}".encode())
+    return digest.hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Returns cached OCR text (memory first, then disk), or None."""
+    return _cache.get(key)
+
+
+def put(key: str, text: str):
+    """Stores OCR text in memory and on disk (atomic write)."""
+    _cache.put(key, text)
@@ -0,0 +1,85 @@
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, List, Optional
+
+import pytesseract
+
+import ocr_cache
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+
+def _init_worker():
+    # Each worker runs one tesseract at a time; OpenMP threads inside it would
+    # only oversubscribe the cores the pool is already using.
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_job(job) -> str:
+    image, lang, config = job
+    return pytesseract.image_to_string(image, lang=lang, config=config)
+
+
+def get_ocr_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Returns the shared OCR process pool (sized to the CPU count by default),
+    creating or resizing it as needed.
+    """
+    global _pool, _pool_size
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        _pool_size = workers
+    return _pool
+
+
+def ocr_images(images: Iterable[Any], lang: Optional[str] = None, config: str = "", workers: Optional[int] = None,
+               dpi: Optional[int] = None, use_cache: bool = True) -> List[str]:
+    """
+    OCRs a batch of images (NumPy arrays or PIL images, e.g. page renders or
+    table crops) across the shared process pool.
+
+    `images` may be a lazy iterable; at most 2 x workers images are in flight
+    at once, so pages can be rendered on demand without holding them all.
+    With use_cache, results are looked up in / stored to ocr_cache, keyed by the
+    pixels, `dpi`, `lang` and `config`; the pool is only started on a miss.
+
+    Returns:
+    - List[str]: OCR text per image, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    results: List[str] = []
+    in_flight = deque()  # (cache key, Future or finished text)
+
+    def collect_oldest():
+        key, item = in_flight.popleft()
+        if isinstance(item, str):
+            results.append(item)
+            return
+        text = item.result()
+        if use_cache:
+            ocr_cache.put(key, text)
+        results.append(text)
+
+    for image in images:
+        key = ocr_cache.ocr_key(image, dpi, lang, config) if use_cache else None
+        text = ocr_cache.get(key) if use_cache else None
+        if text is None and workers == 1:
+            text = _ocr_job((image, lang, config))
+            if use_cache:
+                ocr_cache.put(key, text)
+        if text is not None:
+            in_flight.append((key, text))
+        else:
+            in_flight.append((key, get_ocr_pool(workers).submit(_ocr_job, (image, lang, config))))
+        if len(in_flight) >= 2 * workers:
+            collect_oldest()
+    while in_flight:
+        collect_oldest()
+    logging.info(f"OCR'd {len(results)} images on {workers} workers.")
+    return results
@@ -0,0 +1,44 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+
+def shard_pages(page_numbers: Sequence[int], workers: int) -> List[List[int]]:
+    """
+    Splits page numbers into at most `workers` contiguous shards of near-equal size,
+    preserving page order.
+    """
+    page_numbers = list(page_numbers)
+    workers = max(1, min(workers, len(page_numbers)))
+    size, extra = divmod(len(page_numbers), workers)
+    shards, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(page_numbers[start:end])
+        start = end
+    return [shard for shard in shards if shard]
+
+
+def map_page_shards(pdf_path: str, page_numbers: Sequence[int], worker_fn: Callable, workers: Optional[int] = None) -> list:
+    """
+    Runs worker_fn(pdf_path, shard) for each page shard in a process pool and
+    concatenates the results in page order.
+
+    Parameters:
+    - pdf_path (str): Path to the PDF; every worker opens its own handle
+    - page_numbers (Sequence[int]): Pages to process (0-based)
+    - worker_fn (Callable): Module-level (picklable) function returning a list per shard
+    - workers (int): Pool size, defaults to the number of CPUs
+
+    Returns:
+    - list: Concatenated worker results, in the order of page_numbers
+    """
+    shards = shard_pages(page_numbers, workers or os.cpu_count() or 1)
+    if len(shards) <= 1:
+        return [item for shard in shards for item in worker_fn(pdf_path, shard)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        for shard_result in pool.map(worker_fn, [pdf_path] * len(shards), shards):
+            results.extend(shard_result)
+    return results
@@ -0,0 +1,118 @@
+import fitz  # PyMuPDF
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+
+class PdfSession:
+    """
+    Per-document page-analysis session.
+
+    Opens the PDF once and lazily parses/memoizes each page view
+    ("dict", "text", "links", "blocks"), so the chunkers and the
+    section-metadata extractors can share one parse per page.
+
+    Parameters:
+    - pdf_path (str): Path to the PDF file
+    """
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self._doc = None
+        self._page_count = None
+        self.dirty = False  # True once a view has been parsed that is not persisted yet
+        self._memo: Dict[Tuple[str, int], Any] = {}
+
+    @property
+    def doc(self) -> fitz.Document:
+        if self._doc is None:
+            self._doc = fitz.open(self.pdf_path)
+        return self._doc
+
+    @property
+    def metadata(self) -> Dict:
+        return self.doc.metadata
+
+    def __len__(self) -> int:
+        if self._page_count is None:
+            self._page_count = len(self.doc)
+        return self._page_count
+
+    def page(self, page_no: int) -> fitz.Page:
+        """Returns the (0-based) fitz page."""
+        return self.doc[page_no]
+
+    def cached(self, kind: str, page_no: int, compute: Callable[[fitz.Page], Any]) -> Any:
+        """
+        Returns compute(page) for a 0-based page, computing it at most once per kind.
+        """
+        key = (kind, page_no)
+        if key not in self._memo:
+            self._memo[key] = compute(self.page(page_no))
+            self.dirty = True
+        return self._memo[key]
+
+    def put(self, kind: str, page_no: int, value: Any):
+        """Stores a view computed elsewhere (e.g. by a worker process) for a 0-based page."""
+        self._memo[(kind, page_no)] = value
+        self.dirty = True
+
+    def has(self, kind: str, page_no: int) -> bool:
+        return (kind, page_no) in self._memo
+
+    def get(self, kind: str, page_no: int, default: Any = None) -> Any:
+        """Returns a memoized view without computing it."""
+        return self._memo.get((kind, page_no), default)
+
+    def page_dict(self, page_no: int) -> Dict:
+        return self.cached("dict", page_no, lambda page: page.get_text("dict"))
+
+    def page_text(self, page_no: int) -> str:
+        return self.cached("text", page_no, lambda page: page.get_text("text"))
+
+    def page_links(self, page_no: int) -> List[Dict]:
+        return self.cached("links", page_no, lambda page: page.get_links())
+
+    def page_blocks(self, page_no: int) -> List[Tuple]:
+        return self.cached("blocks", page_no, lambda page: page.get_text("blocks"))
+
+    def snapshot(self) -> Dict:
+        """
+        Returns the memoized page views in a picklable form (image blocks dropped
+        from "dict" views, since nothing downstream reads them).
+        """
+        pages = {}
+        for (kind, page_no), value in self._memo.items():
+            if kind == "dict":
+                value = dict(value, blocks=[b for b in value["blocks"] if "lines" in b])
+            pages[(kind, page_no)] = value
+        return {"page_count": len(self), "pages": pages}
+
+    def restore(self, snapshot: Dict):
+        """Preloads page views produced by snapshot(); already-parsed views win."""
+        self._page_count = snapshot["page_count"]
+        for key, value in snapshot["pages"].items():
+            self._memo.setdefault(key, value)
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def open_session(pdf: Union[str, PdfSession]) -> Iterator[PdfSession]:
+    """
+    Yields `pdf` if it already is a PdfSession (left open for its owner), otherwise
+    a new session for the path that is closed when the block exits.
+    """
+    if isinstance(pdf, PdfSession):
+        yield pdf
+    else:
+        with PdfSession(pdf) as session:
+            yield session
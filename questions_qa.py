@@ -1,3 +1,5 @@
+from embedding_cache import CachedEmbeddings
+from vector_store import load_or_build_llama_index
 
 def clean_text(text):
     """Remove unwanted characters like tabs and question numbers."""
@@ -57,7 +59,7 @@ def perform_qa_for_section(section, base_path, excel_path):
         model_kwargs={"torch_dtype": "torch.float16", "load_in_8bit": True}
     )
     
-    embed_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+    embed_model = CachedEmbeddings(HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2"))
     service_context = ServiceContext.from_defaults(chunk_size=1024, llm=llm, embed_model=embed_model)
 
     # Load questions and answers from Excel
@@ -74,15 +76,17 @@ def perform_qa_for_section(section, base_path, excel_path):
             
             company_name = os.path.splitext(file_name)[0]  # Extract company name from file name
             
-            # Read the document
-            with open(file_path, 'r', encoding='utf-8') as file:
-                document_text = file.read()
-            
-            # Create a list of documents for the index
-            documents = [{"text": document_text, "metadata": {"source": file_path}}]
+            def load_documents():
+                # Read the document
+                with open(file_path, 'r', encoding='utf-8') as file:
+                    document_text = file.read()
+
+                # Create a list of documents for the index
+                return [{"text": document_text, "metadata": {"source": file_path}}]
             
-            # Create index from document
-            index = VectorStoreIndex.from_documents(documents, service_context=service_context)
+            # Create index from document (reloaded from disk when this file was already embedded)
+            index = load_or_build_llama_index(file_path, load_documents, service_context, embed_model,
+                                              params={"chunk_size": 1024})
             query_engine = index.as_query_engine()
             
             # Get questions and reference answers for the current company
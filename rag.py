@@ -1,5 +1,4 @@
 from langchain.chains import RetrievalQA
-from langchain.vectorstores import FAISS
 from langchain.embeddings import HuggingFaceEmbeddings
 from langchain.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -7,24 +6,29 @@ from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
 from sentence_transformers import SentenceTransformer
 from langchain.llms import HuggingFacePipeline
 import torch
+from embedding_cache import CachedEmbeddings
+from vector_store import load_or_build_faiss
 
 # Step 1: Load the PDF and Parse it
 pdf_path = "path/to/your/pdf/document.pdf"
-loader = PyPDFLoader(pdf_path)
-documents = loader.load()
+chunk_params = {"chunk_size": 1000, "chunk_overlap": 200}
 
-# Step 2: Split the text into chunks for processing
-text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-split_docs = text_splitter.split_documents(documents)
+def load_split_docs():
+    loader = PyPDFLoader(pdf_path)
+    documents = loader.load()
+
+    # Step 2: Split the text into chunks for processing
+    text_splitter = RecursiveCharacterTextSplitter(**chunk_params)
+    return text_splitter.split_documents(documents)
 
 # Step 3: Set up the Embedding Model
 embedding_model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
 
 # Step 4: Convert the documents to embeddings
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+embeddings = CachedEmbeddings(HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2"))
 
-# Step 5: Store embeddings in a FAISS Vector Store
-vectorstore = FAISS.from_documents(split_docs, embeddings)
+# Step 5: Store embeddings in a FAISS Vector Store (reloaded from disk when this PDF was already embedded)
+vectorstore = load_or_build_faiss(pdf_path, load_split_docs, embeddings, chunk_params)
 
 # Step 6: Set up the LLaMA Model and Tokenizer
 tokenizer = AutoTokenizer.from_pretrained("meta-llama/Llama-2-7b")
@@ -0,0 +1,96 @@
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+# Section of the pages before the first TOC entry (cover, disclaimers, the TOC itself)
+FRONT_MATTER = "Front matter"
+FRONT_MATTER_LEVEL = 0
+
+
+def _next_start_pages(starts: List[int], strict: bool) -> List[Optional[int]]:
+    """
+    For every entry, the start page of the first *later* TOC entry whose start is
+    > (strict) or >= (not strict) its own, in one right-to-left monotonic-stack pass.
+    """
+    result: List[Optional[int]] = [None] * len(starts)
+    stack: List[int] = []
+    for i in range(len(starts) - 1, -1, -1):
+        while stack and (stack[-1] <= starts[i] if strict else stack[-1] < starts[i]):
+            stack.pop()
+        result[i] = stack[-1] if stack else None
+        stack.append(starts[i])
+    return result
+
+
+class SectionIndex:
+    """
+    Page/section lookups for one document's TOC, built once.
+
+    Answers page -> section, section -> page range/count and level queries in
+    O(log n) (or O(1)) instead of rescanning the TOC for every page or entry.
+
+    Parameters:
+    - toc (List[List]): [[level, title, start_page], ...] in TOC order (1-based pages)
+    - num_pages (int): Number of pages in the document
+    """
+
+    def __init__(self, toc: List[List], num_pages: int):
+        self.entries = [tuple(entry) for entry in toc]
+        self.num_pages = num_pages
+        starts = [entry[2] for entry in self.entries]
+
+        # Sorted by start page (TOC order breaks ties) for bisect lookups
+        self._order = sorted(range(len(starts)), key=lambda i: (starts[i], i))
+        self._sorted_starts = [starts[i] for i in self._order]
+
+        self._next_strict = _next_start_pages(starts, strict=True)
+        self._next_loose = _next_start_pages(starts, strict=False)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def level(self, i: int) -> int:
+        return self.entries[i][0]
+
+    def title(self, i: int) -> str:
+        return self.entries[i][1]
+
+    def section_at(self, page_no: int) -> Optional[int]:
+        """
+        Index of the TOC entry covering a 1-based page: the last entry starting at or
+        before it (the deepest one when several start on the same page), or None
+        for pages before the first entry.
+        """
+        pos = bisect_right(self._sorted_starts, page_no)
+        return self._order[pos - 1] if pos else None
+
+    def title_level_at(self, page_no: int) -> Tuple[str, int]:
+        """
+        (title, level) of the section covering a 1-based page. Pages before the
+        first TOC entry belong to no section and get (FRONT_MATTER, FRONT_MATTER_LEVEL).
+        """
+        i = self.section_at(page_no)
+        if i is None:
+            return FRONT_MATTER, FRONT_MATTER_LEVEL
+        return self.entries[i][1], self.entries[i][0]
+
+    def next_start(self, i: int, strict: bool = True) -> Optional[int]:
+        """
+        Start page of the first later entry beginning after (strict) or at/after
+        (not strict) entry i's start page; None for the last section.
+        """
+        return self._next_strict[i] if strict else self._next_loose[i]
+
+    def page_count(self, i: int, strict: bool = True) -> int:
+        """
+        Pages from entry i's start up to the next section (or document end), unclamped.
+        """
+        start = self.entries[i][2]
+        next_start = self.next_start(i, strict)
+        if next_start is None:
+            return self.num_pages - start + 1
+        return next_start - start
+
+    def page_range(self, i: int, strict: bool = True) -> Tuple[int, int]:
+        """(first_page, last_page), 1-based and inclusive."""
+        start = self.entries[i][2]
+        return start, start + max(1, self.page_count(i, strict)) - 1
@@ -0,0 +1,100 @@
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Union
+
+import date_scanner
+from parallel_pages import map_page_shards
+from pdf_session import PdfSession, open_session
+from section_index import SectionIndex
+from span_table import SpanTable
+
+
+def page_metadata(spans: SpanTable, page_no: int, date_lines: int = 20, date_min_len: int = 4,
+                  allow_month_year: bool = False) -> Dict:
+    """
+    Title, subtitle, headline and creation date of one (0-based) start page, all
+    read from the same span table.
+
+    Parameters:
+    - spans (SpanTable): Span table holding the page
+    - page_no (int): 0-based page number
+    - date_lines (int): Number of top lines scanned for the creation date
+    - date_min_len (int): Shortest line (in characters) counted among those top lines
+    - allow_month_year (bool): Accept a bare month-year as the date, see date_scanner.iter_dates
+
+    Returns:
+    - Dict: title (largest-font lines), subtitle (line after the title), largest_span
+      (largest-font span of 6+ chars), headline (first line with 5+ words or 40+
+      chars) and headline_subtitle (line after it), creation_date (as written) and
+      date_iso (normalized)
+    """
+    title, subtitle = "", ""
+    title_rows = spans.largest_font_lines(page_no)
+    if len(title_rows):
+        title = " ".join(spans.texts(title_rows)).strip()
+        subtitle = spans.line_after(page_no, title_rows[0])
+
+    lines = spans.texts(spans.page_lines(page_no, min_len=4))
+    headline_at = next((i for i, line in enumerate(lines) if len(line.split()) >= 5 or len(line) >= 40), 0)
+    headline = lines[headline_at] if lines else ""
+    headline_subtitle = lines[headline_at + 1] if headline_at + 1 < len(lines) else ""
+
+    top_text = " ".join(" ".join(spans.top_lines(page_no, date_lines, date_min_len)).split())
+    date = date_scanner.find_date(top_text, allow_month_year=allow_month_year)
+    return {
+        "title": title,
+        "subtitle": subtitle,
+        "largest_span": spans.largest_font_span(page_no, min_len=6),
+        "headline": headline,
+        "headline_subtitle": headline_subtitle,
+        "creation_date": date.text if date else "",
+        "date_iso": date.iso if date else "",
+    }
+
+
+def _page_metadata_shard(pdf_path: str, page_numbers: List[int], **options) -> List[Dict]:
+    session = PdfSession(pdf_path)
+    try:
+        spans = SpanTable.from_session(session, page_numbers)
+        return [page_metadata(spans, page_no, **options) for page_no in page_numbers]
+    finally:
+        session.close()
+
+
+def extract_section_metadata(pdf_path: Union[str, PdfSession], toc: List[List], workers: Optional[int] = None,
+                             strict: bool = True, min_page_count: int = 1, **options) -> List[Dict]:
+    """
+    Section metadata for every TOC entry from a single pass over the unique start pages.
+
+    Parameters:
+    - pdf_path (str | PdfSession): Path to the PDF file, or an open session
+    - toc (List[List]): [[level, section, start_page], ...] (1-based pages)
+    - workers (int): >1 spreads the start pages over a process pool (each worker
+      parses its own shard); default parses inline, reusing the session's pages
+    - strict (bool): Page-count rule, see SectionIndex.page_count
+    - min_page_count (int): Floor of page_count (entries sharing a start page count 0 pages)
+    - options: date_lines, date_min_len and allow_month_year, passed to page_metadata
+
+    Returns:
+    - List[Dict]: level, section, page_start, page_count plus the page_metadata fields
+    """
+    with open_session(pdf_path) as session:
+        sections = SectionIndex(toc, len(session))
+        start_pages: Sequence[int] = sorted({start_page - 1 for _, _, start_page in toc})
+
+        if workers and workers > 1 and len(start_pages) > 1:
+            results = map_page_shards(session.pdf_path, start_pages, partial(_page_metadata_shard, **options), workers)
+        else:
+            spans = SpanTable.from_session(session, start_pages)
+            results = [page_metadata(spans, page_no, **options) for page_no in start_pages]
+        by_page = dict(zip(start_pages, results))
+
+        enriched = []
+        for i, (level, section, start_page) in enumerate(toc):
+            enriched.append({
+                "level": level,
+                "section": section,
+                "page_start": start_page,
+                "page_count": max(min_page_count, sections.page_count(i, strict)),
+                **by_page[start_page - 1],
+            })
+        return enriched
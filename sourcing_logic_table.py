@@ -1,94 +1,205 @@
-def get_chunks(file_name):
-    tocs = pdf_get_toc(file_name)
-    tocs.sort(key=lambda x: x['id'], reverse=True)
-    rs = []
-    
+import fitz
+from functools import partial
+
+import extraction_engine
+from chunk_store import ChunkStore, render_chunk_text
+import layout_cache
+from parallel_pages import map_page_shards
+from pdf_session import open_session
+
+
+def _extract_page_shard(file_name, page_numbers, dnd_pages=(), single_pass=False):
+    """
+    Worker for get_chunks(workers=N): parses a shard of pages with its own fitz handle.
+    Returns [(page_no, kind, parsed, dnd_or_None), ...] in page order.
+    """
+    rows = []
     with fitz.open(file_name) as doc:
-        doctitle = doc.metadata['title']
-        page_no = 0
-    
-        while page_no < len(doc):
-            # Initialize the current page
-            page = doc[page_no]  # Ensure `page` is assigned
-            
-            title, lvl = pdf_toc.get_title_from_page_no(tocs, page_no + 1)
-            if lvl == 2 and pdf_toc.is_page_dnd(page):
-                print(f"skip page: {page_no+1} onwards")
-                while page_no + 1 < len(doc):
-                    page_no = page_no + 1
-                    new_title, new_lvl = pdf_toc.get_title_from_page_no(tocs, page_no + 1)
-                    if new_title == title:
-                        # Change of title
-                        if title == 'Deutsche Bank':
-                            # Processing the last page
-                            page_no = page_no + 1
-                        page = doc[page_no]  # Reassign `page` here
-                        break
-                print(f"skip resume page: {page_no+1}")
-            blks = pdf_toc.get_page_blocks(page)  # `page` is guaranteed to be assigned here
-            for blk in blks:
-                blk_text = pdf_toc.post_process_text(blk[4])
-                if len(blk_text) > 0:
-                    rs.append({
-                        'title': title,
-                        'page_no': page_no + 1,
-                        'block_no_from': blk[5],
-                        'block_no_to': blk[5],
-                        'text': blk_text
-                    })
-    
-            # Increment page number
-            page_no += 1
+        for page_no in page_numbers:
+            page = doc[page_no]
+            dnd = pdf_toc.is_page_dnd(page) if page_no in dnd_pages else None
+            if single_pass:
+                rows.append((page_no, "content", extraction_engine.parse_page_content(page), dnd))
+            else:
+                rows.append((page_no, "page_blocks", pdf_toc.get_page_blocks(page), dnd))
+    return rows
+
+
+def _title_lookup(tocs, section_index=None):
+    """page_no (1-based) -> (title, level), via the SectionIndex when one is given."""
+    if section_index is not None:
+        return section_index.title_level_at
+    return partial(pdf_toc.get_title_from_page_no, tocs)
+
+
+def _prefill_page_blocks(file_name, session, title_at, workers, single_pass=False):
+    """Parses every page not yet in the session across a process pool and stores the results in it."""
+    kind = "content" if single_pass else "page_blocks"
+    pending = [p for p in range(len(session)) if not session.has(kind, p)]
+    if not pending:
+        return
+    dnd_pages = {p for p in pending if title_at(p + 1)[1] == 2}
+    worker = partial(_extract_page_shard, dnd_pages=dnd_pages, single_pass=single_pass)
+    for page_no, kind, parsed, dnd in map_page_shards(file_name, pending, worker, workers):
+        session.put(kind, page_no, parsed)
+        if dnd is not None:
+            session.put("dnd", page_no, dnd)
+
+
+def iter_page_blocks(file_name, session, title_at, single_pass=False, use_cache=True, cache_dir=None):
+    """
+    Stage 1: yields one record per text block in page order, followed by one record
+    per flattened table. title_at maps a 1-based page to its (title, level).
+    """
+    doctitle = session.metadata['title']
+    page_no = 0
+
+    while page_no < len(session):
+        title, lvl = title_at(page_no + 1)
+        if lvl == 2 and session.cached("dnd", page_no, pdf_toc.is_page_dnd):
+            print(f"skip page: {page_no+1} onwards")
+            while page_no + 1 < len(session):
+                page_no = page_no + 1
+                new_title, new_lvl = title_at(page_no + 1)
+                if new_title == title:
+                    # Change of title
+                    if title == 'Deutsche Bank':
+                        # Processing the last page
+                        page_no = page_no + 1
+                    break
+            print(f"skip resume page: {page_no+1}")
+        if single_pass:
+            # Text and tables come from one parse; text inside table bboxes is suppressed
+            blks = extraction_engine.page_content(session, page_no)["blocks"]
+        else:
+            blks = session.cached("page_blocks", page_no, pdf_toc.get_page_blocks)  # parsed once per session
+        for blk in blks:
+            blk_text = pdf_toc.post_process_text(blk[4])
+            if len(blk_text) > 0:
+                yield {
+                    'title': title,
+                    'page_no': page_no + 1,
+                    'block_no_from': blk[5],
+                    'block_no_to': blk[5],
+                    'text': blk_text
+                }
+
+        # Increment page number
+        page_no += 1
 
     # NEW: Extract tables and append to rs
-    tables = extract_tables_from_file(file_name)
+    if single_pass:
+        tables = [table for p in range(len(session)) for table in extraction_engine.page_content(session, p)["tables"]]
+    else:
+        tables = extract_tables_from_file(file_name, use_cache=use_cache, cache_dir=cache_dir)
+
+    if use_cache:
+        layout_cache.persist_session(session, cache_dir)
     for table in tables:
         # Flatten table using your flattening function
         flattened_text = flatten_table_to_text(table['data'])
         
-        # Append the flattened table to rs
-        rs.append({
+        yield {
             'title': table['title'],               # Use the table's title
             'page_no': table['page_number'],       # Correct page number from table metadata
             'block_no_from': 0,                   # No block range for tables
             'block_no_to': 0,                     # No block range for tables
             'text': flattened_text                # Flattened table data
-        })
-    
-    # Handle incomplete blocks
-    rs1 = []
-    for i in range(0, len(rs)):
-        if i == 0:
-            rs1.append(rs[i].copy())
-        elif rs1[len(rs1)-1]['text'][-2:] == "-\n" or rs1[len(rs1)-1]['text'][-2:] == "\n":
-            rs1[len(rs1)-1]['text'] = rs1[len(rs1)-1]['text'][:-1] + rs[i]['text']
-            rs1[len(rs1)-1]['block_no_to'] = rs[i]['block_no_to']
-        elif len(rs1[len(rs1)-1]['text']) < 200:
-            rs1[len(rs1)-1]['text'] += rs[i]['text']
-            rs1[len(rs1)-1]['block_no_to'] = rs[i]['block_no_to']
+        }
+
+
+def merge_incomplete_blocks(records):
+    """Stage 2: glues a block onto the previous one while that one is hyphen-broken or under 200 chars."""
+    last = None
+    for record in records:
+        if last is None:
+            last = record.copy()
+        elif last['text'][-2:] == "-\n" or last['text'][-2:] == "\n":
+            last['text'] = last['text'][:-1] + record['text']
+            last['block_no_to'] = record['block_no_to']
+        elif len(last['text']) < 200:
+            last['text'] += record['text']
+            last['block_no_to'] = record['block_no_to']
         else:
-            rs1.append(rs[i].copy())
-    
-    # Split into smaller chunks
-    rs2 = []
-    for i in range(0, len(rs1)):
+            yield last
+            last = record.copy()
+    if last is not None:
+        yield last
+
+
+def split_into_sentences(records):
+    """Stage 3: splits every merged block except the first into sentence chunks."""
+    for i, record in enumerate(records):
         if i == 0:
-            rs2.append(rs1[i].copy())
+            yield record
         else:
-            for sentence in split_text(rs1[i]['text']):
-                temp = rs1[i].copy()
+            for sentence in split_text(record['text']):
+                temp = record.copy()
                 temp['text'] = sentence
-                rs2.append(temp)
-    
-    # Add document metadata
-    company_name = Path(file_name).stem
-    for item in rs2:
-        item['text'] = f"""
-        ---
-        company name: '{company_name}'
-        SourceRef: '{item['title']}-Page: {item['page_no']}-ispn-{item['page_no']}-{item['block_no_from']}-{item['block_no_to']}-ispn'
-        text:
-        {item['text']}
-        ---
-        """
-    return rs2
+                yield temp
+
+
+def add_document_metadata(records, company_name):
+    """Stage 4: wraps each chunk's text in the company name / SourceRef header."""
+    for item in records:
+        item['text'] = render_chunk_text(company_name, item['title'], item['page_no'],
+                                         item['block_no_from'], item['block_no_to'], item['text'])
+        yield item
+
+
+def _iter_merged_blocks(file_name, session, use_cache, workers, single_pass, section_index, cache_dir=None):
+    """Stages 1-2 shared by iter_chunks and get_chunk_store."""
+    if section_index is None:
+        tocs = pdf_get_toc(file_name)
+        tocs.sort(key=lambda x: x['id'], reverse=True)
+    else:
+        tocs = None
+    title_at = _title_lookup(tocs, section_index)
+
+    # Reuse the caller's session so pages parsed for section metadata are not parsed again
+    with open_session(session or file_name) as session:
+        if use_cache:
+            # Warm re-ingest: page blocks/DND flags parsed by an earlier upload of the same PDF
+            layout_cache.warm_session(session, cache_dir)
+        if workers and workers > 1:
+            # Large packs: parse page shards on a process pool, then walk them in page order below
+            _prefill_page_blocks(file_name, session, title_at, workers, single_pass)
+
+        records = iter_page_blocks(file_name, session, title_at, single_pass, use_cache, cache_dir)
+        yield from merge_incomplete_blocks(records)
+
+
+def iter_chunks(file_name, session=None, use_cache=True, workers=None, single_pass=False, section_index=None,
+                cache_dir=None):
+    """
+    Streaming get_chunks: chunks are yielded as soon as their page has been parsed,
+    so embedding can start on the first pages while later pages are still being
+    read, and no full intermediate list is ever held. Passing the document's
+    SectionIndex replaces the per-page linear TOC scan with a bisect lookup.
+    use_cache=False neither reads nor writes the layout cache (cache_dir, default
+    RESEA_LAYOUT_CACHE).
+    """
+    records = _iter_merged_blocks(file_name, session, use_cache, workers, single_pass, section_index, cache_dir)
+    records = split_into_sentences(records)
+    yield from add_document_metadata(records, Path(file_name).stem)
+
+
+def get_chunk_store(file_name, session=None, use_cache=True, workers=None, single_pass=False, section_index=None,
+                    cache_dir=None):
+    """
+    Same chunks as get_chunks, kept in a compact ChunkStore: sentence chunks are
+    offsets into their block's text and headers are rendered only via Chunk.render().
+    """
+    store = ChunkStore(Path(file_name).stem)
+    records = _iter_merged_blocks(file_name, session, use_cache, workers, single_pass, section_index, cache_dir)
+    for i, record in enumerate(records):
+        if i == 0:
+            store.add(record)
+        else:
+            store.add_split(record, split_text(record['text']))
+    return store
+
+
+def get_chunks(file_name, session=None, use_cache=True, workers=None, single_pass=False, section_index=None,
+               cache_dir=None):
+    return list(iter_chunks(file_name, session, use_cache, workers, single_pass, section_index, cache_dir))
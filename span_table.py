@@ -0,0 +1,134 @@
+import numpy as np
+from typing import Dict, Iterable, List, Tuple
+
+from pdf_session import PdfSession
+
+
+class SpanTable:
+    """
+    Columnar span/line table for a set of pages, built from one "dict" parse per page.
+
+    Spans and lines are stored as NumPy columns (page, font size, flags, bbox,
+    text length) with their texts concatenated into one buffer addressed by
+    offsets, so the title/subtitle heuristics run as vectorized queries instead
+    of nested Python loops. Pages are deduplicated, so TOC entries sharing a
+    start page cost one parse.
+
+    Line text is the space-joined span text, stripped; a line's font size is
+    that of its first span.
+    """
+
+    def __init__(self, spans: Dict[str, list], lines: Dict[str, list], span_texts: List[str], line_texts: List[str]):
+        self.span_page = np.asarray(spans["page"], dtype=np.int32)
+        self.span_size = np.asarray(spans["size"], dtype=np.float64)
+        self.span_flags = np.asarray(spans["flags"], dtype=np.int32)
+        self.span_bbox = np.asarray(spans["bbox"], dtype=np.float32).reshape(-1, 4)
+        self.span_line = np.asarray(spans["line"], dtype=np.int32)
+        self.span_len = np.asarray([len(t) for t in span_texts], dtype=np.int32)  # stripped length
+
+        self.line_page = np.asarray(lines["page"], dtype=np.int32)
+        self.line_size = np.asarray(lines["size"], dtype=np.float64)
+        self.line_bbox = np.asarray(lines["bbox"], dtype=np.float32).reshape(-1, 4)
+        self.line_len = np.asarray([len(t) for t in line_texts], dtype=np.int32)
+
+        self._span_buffer, self._span_offsets = self._pack(span_texts)
+        self._line_buffer, self._line_offsets = self._pack(line_texts)
+        self._line_ranges = self._page_ranges(self.line_page)
+        self._span_ranges = self._page_ranges(self.span_page)
+
+    @staticmethod
+    def _pack(texts: List[str]) -> Tuple[str, np.ndarray]:
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+        return "".join(texts), offsets
+
+    @staticmethod
+    def _page_ranges(pages: np.ndarray) -> Dict[int, Tuple[int, int]]:
+        # Rows are appended page by page in ascending order, so each page is one [lo, hi) slice
+        uniq, first = np.unique(pages, return_index=True)
+        bounds = np.append(first[1:], len(pages))
+        return {int(p): (int(lo), int(hi)) for p, lo, hi in zip(uniq, first, bounds)}
+
+    @classmethod
+    def from_session(cls, session: PdfSession, pages: Iterable[int]) -> "SpanTable":
+        """
+        Builds the table for the given 0-based pages (duplicates parsed once).
+        """
+        spans = {"page": [], "size": [], "flags": [], "bbox": [], "line": []}
+        lines = {"page": [], "size": [], "bbox": []}
+        span_texts, line_texts = [], []
+
+        for page_no in sorted(set(pages)):
+            for block in session.page_dict(page_no)["blocks"]:
+                if "lines" not in block:
+                    continue
+                for line in block["lines"]:
+                    if not line["spans"]:
+                        continue
+                    line_id = len(line_texts)
+                    for span in line["spans"]:
+                        spans["page"].append(page_no)
+                        spans["size"].append(span.get("size", 0))
+                        spans["flags"].append(span.get("flags", 0))
+                        spans["bbox"].append(span.get("bbox", (0, 0, 0, 0)))
+                        spans["line"].append(line_id)
+                        span_texts.append(span.get("text", "").strip())
+                    lines["page"].append(page_no)
+                    lines["size"].append(line["spans"][0]["size"])
+                    lines["bbox"].append(line.get("bbox", (0, 0, 0, 0)))
+                    line_texts.append(" ".join(span["text"] for span in line["spans"]).strip())
+
+        return cls(spans, lines, span_texts, line_texts)
+
+    # --- text access ---
+
+    def line_text(self, i: int) -> str:
+        return self._line_buffer[self._line_offsets[i]:self._line_offsets[i + 1]]
+
+    def span_text(self, i: int) -> str:
+        return self._span_buffer[self._span_offsets[i]:self._span_offsets[i + 1]]
+
+    def page_lines(self, page_no: int, min_len: int = 1) -> np.ndarray:
+        """Row indices of a page's lines with at least `min_len` characters, in reading order."""
+        lo, hi = self._line_ranges.get(page_no, (0, 0))
+        rows = np.arange(lo, hi)
+        return rows[self.line_len[lo:hi] >= min_len]
+
+    # --- vectorized queries ---
+
+    def largest_font_span(self, page_no: int, min_len: int = 6) -> str:
+        """Text of the first span with the largest font among spans of `min_len`+ characters."""
+        lo, hi = self._span_ranges.get(page_no, (0, 0))
+        rows = np.arange(lo, hi)[self.span_len[lo:hi] >= min_len]
+        if not len(rows):
+            return ""
+        return self.span_text(int(rows[np.argmax(self.span_size[rows])]))
+
+    def largest_font_lines(self, page_no: int, min_len: int = 1) -> np.ndarray:
+        """Row indices of the page's lines set in its largest font size."""
+        rows = self.page_lines(page_no, min_len)
+        if not len(rows):
+            return rows
+        sizes = self.line_size[rows]
+        return rows[sizes == sizes.max()]
+
+    def lines_above_threshold(self, page_no: int, ratio: float, min_len: int = 1) -> np.ndarray:
+        """Row indices of lines whose font size is >= ratio x the page's largest line font."""
+        rows = self.page_lines(page_no, min_len)
+        if not len(rows):
+            return rows
+        sizes = self.line_size[rows]
+        return rows[sizes >= sizes.max() * ratio]
+
+    def line_after(self, page_no: int, row: int, min_len: int = 1) -> str:
+        """Text of the next qualifying line on the same page after line `row`, or ""."""
+        rows = self.page_lines(page_no, min_len)
+        later = rows[rows > row]
+        return self.line_text(int(later[0])) if len(later) else ""
+
+    def top_lines(self, page_no: int, n: int, min_len: int = 1) -> List[str]:
+        """Texts of the first n qualifying lines of a page."""
+        return [self.line_text(int(i)) for i in self.page_lines(page_no, min_len)[:n]]
+
+    def texts(self, rows: Iterable[int]) -> List[str]:
+        return [self.line_text(int(i)) for i in rows]
@@ -1,10 +1,13 @@
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from pymupdf4llm import to_markdown
-from typing import List
+from typing import Dict, List, Optional
 import traceback
+import llm_batch
+import table_gate
 
 # === PromptTemplate setup ===
+TABLE_PROMPT_VERSION = "table-v1"
 table_prompt = PromptTemplate(
     input_variables=["page_no", "page_text"],
     template="""
@@ -49,26 +52,63 @@ def flatten_table_to_text(table_data: list) -> str:
     table_text = "\n".join([" | ".join(row) for row in rows])
     return f"Table Start\nTable Data:\n{table_text}\nTable End"
 
+# === All table pages → markdown in one pass ===
+def markdown_pages(file_name: str, page_numbers: List[int]) -> Dict[int, str]:
+    """
+    Converts the given 1-based pages with a single to_markdown call.
+
+    Returns:
+    - Dict[int, str]: 1-based page number → stripped markdown text
+    """
+    if not page_numbers:
+        return {}
+    chunks = to_markdown(file_name, pages=[p - 1 for p in page_numbers], page_chunks=True)
+    return {chunk["metadata"]["page"]: chunk["text"].strip() for chunk in chunks}
+
 # === Main function ===
-def refine_plumber_tables_with_llm(file_name: str, tables: List[dict], llm_pipeline, rs1: List[dict]):
-    table_pages = sorted(set([table['page_number'] for table in tables]))
+def refine_plumber_tables_with_llm(file_name: str, tables: List[dict], llm_pipeline, rs1: List[dict],
+                                   batch_size: int = 8, concurrency: int = 1, use_gate: bool = True,
+                                   page_numbers: Optional[List[int]] = None):
+    """
+    Re-reads every page that has a pdfplumber table through the LLM and appends the
+    reconstructed tables to rs1, in page order.
+
+    All pages are converted to markdown in one to_markdown call and sent to the
+    chain in batches of `batch_size`, with up to `concurrency` batches in flight.
+    `page_numbers` (1-based) adds pages pdfplumber found no table on; with use_gate,
+    those are skipped unless table_gate scores them as likely tables.
+    """
+    plumber_pages = set([table['page_number'] for table in tables])
+    table_pages = sorted(plumber_pages | set(page_numbers or []))
+    if use_gate:
+        table_pages = table_gate.gate_pages(file_name, table_pages, table_pages=plumber_pages)
     chain = get_llm_chain(llm_pipeline)
 
+    try:
+        page_texts = markdown_pages(file_name, table_pages)
+    except Exception:
+        print(f"⚠️ Error converting pages {table_pages} to markdown")
+        traceback.print_exc()
+        return
+
+    pages = []
     for page_no in table_pages:
+        if page_texts.get(page_no):
+            pages.append(page_no)
+        else:
+            print(f"⚠️ No markdown content found for page {page_no}")
+
+    # 🔍 Run the LLM via LangChain, batched
+    inputs = [{"page_no": page_no, "page_text": page_texts[page_no]} for page_no in pages]
+    outputs = llm_batch.apply_chain(chain, inputs, batch_size=batch_size, concurrency=concurrency,
+                                    template_version=TABLE_PROMPT_VERSION)
+
+    for page_no, llm_output in zip(pages, outputs):
+        if llm_output is None:
+            print(f"⚠️ Error processing page {page_no}")
+            continue
         try:
-            md_text = to_markdown(file_name, pages=[page_no])
-            if not md_text or not md_text[0].strip():
-                print(f"⚠️ No markdown content found for page {page_no}")
-                continue
-
-            markdown_page_text = md_text[0].strip()
-
-            # 🔍 Run the LLM via LangChain
-            llm_output = chain.run({
-                "page_no": page_no,
-                "page_text": markdown_page_text
-            }).strip()
-
+            llm_output = llm_output.strip()
             print(f"\n🔍 LLM Output for Page {page_no}:\n{llm_output}\n{'-'*60}")
 
             if "no table found" not in llm_output.lower():
@@ -1,44 +1,39 @@
 import pdfplumber
 import pandas as pd
+import layout_cache
+from parallel_pages import map_page_shards
 
-def extract_tables_from_file(filename):
-    """
-    Extract tables and their metadata from a PDF file.
-
-    Args:
-        filename (str): Path to the PDF file.
+def extract_titles_above_tables(page, table_bboxes):
+    """Extract titles (lines) above each table."""
+    titles = []
+    for table_bbox in table_bboxes:
+        title_bbox = (0, 0, page.width, table_bbox[1])  # Text above the table
+        title_text = page.crop(title_bbox).extract_text()
+        if title_text:
+            lines = title_text.split('\n')[:5]  # Limit to top 5 lines
+            title = next((line.strip() for line in lines if line.startswith("Table")), None)
+            titles.append(title)
+        else:
+            titles.append("")  # No title found
+    return titles
 
-    Returns:
-        list: A list of dictionaries containing table metadata and data.
+def _extract_page_shard(filename, page_numbers):
     """
-    def get_table_bboxes(page):
-        """Get bounding boxes for tables."""
-        return [table.bbox for table in page.find_tables()]
-
-    def extract_titles_above_tables(page, table_bboxes):
-        """Extract titles (lines) above each table."""
-        titles = []
-        for table_bbox in table_bboxes:
-            title_bbox = (0, 0, page.width, table_bbox[1])  # Text above the table
-            title_text = page.crop(title_bbox).extract_text()
-            if title_text:
-                lines = title_text.split('\n')[:5]  # Limit to top 5 lines
-                title = next((line.strip() for line in lines if line.startswith("Table")), None)
-                titles.append(title)
-            else:
-                titles.append("")  # No title found
-        return titles
-
-    # Initialize results
-    all_tables = []
-
-    # Open the PDF file
+    Pool worker of extract_tables_from_file: find_tables() once per page, "Table ..."
+    titles from the text above each table, rows as DataFrame records.
+    """
+    shard_tables = []
+
+    # Each worker opens its own handle on the PDF
     with pdfplumber.open(filename) as pdf:
-        for page_no, page in enumerate(pdf.pages):
-            # Get table bounding boxes and titles
-            table_bboxes = get_table_bboxes(page)
+        for page_no in page_numbers:
+            page = pdf.pages[page_no]
+
+            # Detect tables once; bboxes, titles and cell data all come from the same result
+            found_tables = page.find_tables()
+            table_bboxes = [table.bbox for table in found_tables]
             titles = extract_titles_above_tables(page, table_bboxes)
-            tables = page.extract_tables()
+            tables = [table.extract() for table in found_tables]
 
             # Process each table
             if tables:
@@ -57,6 +52,31 @@ def extract_tables_from_file(filename):
                         "title": titles[table_index] if table_index < len(titles) else f"Table_Page{page_no+1}_{table_index+1}",
                         "data": table_data
                     }
-                    all_tables.append(table_info)
-    
-    return all_tables
+                    shard_tables.append(table_info)
+
+            page.flush_cache()  # Keep memory flat on long documents
+
+    return shard_tables
+
+def extract_tables_from_file(filename, use_cache=True, workers=None, cache_dir=None):
+    """
+    Extract tables and their metadata from a PDF file.
+
+    Args:
+        filename (str): Path to the PDF file.
+        use_cache (bool): Reuse tables extracted by an earlier ingest of the same PDF content.
+        workers (int): Pages are split across this many worker processes (default: serial).
+        cache_dir (str): Layout cache directory (default: RESEA_LAYOUT_CACHE).
+
+    Returns:
+        list: A list of dictionaries containing table metadata and data, in page/table order.
+    """
+    if use_cache:
+        return layout_cache.cached_layout(filename, "tables",
+                                          lambda: extract_tables_from_file(filename, use_cache=False, workers=workers),
+                                          cache_dir)
+
+    with pdfplumber.open(filename) as pdf:
+        page_numbers = list(range(len(pdf.pages)))
+
+    return map_page_shards(filename, page_numbers, _extract_page_shard, workers or 1)
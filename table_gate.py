@@ -0,0 +1,138 @@
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pdfplumber
+
+from logoplay import MIN_TABLE_LINES, MIN_WORDS, tableish_line_count
+from pdf_session import PdfSession, open_session
+
+# Pages/chunks forwarded to vs kept away from the LLM table stage, process-wide
+# (known_table: pages forwarded unscored because pdfplumber already found a table)
+GATE_STATS = Counter()
+
+
+def text_features(text: str) -> Dict[str, float]:
+    """
+    Cheap table signals from plain or markdown text.
+
+    Returns:
+    - Dict: word_count, tableish_lines (logoplay.tableish_line_count), digit_density
+      (digits / non-space chars) and pipe_lines (markdown table rows)
+    """
+    chars = [c for c in text if not c.isspace()]
+    lines = text.splitlines()
+    return {
+        "word_count": len(text.split()),
+        "tableish_lines": tableish_line_count(text),
+        "digit_density": sum(c.isdigit() for c in chars) / len(chars) if chars else 0.0,
+        "pipe_lines": sum(1 for line in lines if line.count("|") >= 2),
+    }
+
+
+def aligned_columns(session: PdfSession, page_no: int, min_rows: int = 3, tolerance: float = 2.0) -> int:
+    """
+    Number of x positions (spans' left edges, binned by `tolerance` points) shared
+    by at least `min_rows` lines of a 0-based page; table columns line up, prose doesn't.
+    """
+    starts = []
+    for block in session.page_dict(page_no)["blocks"]:
+        for line_no, line in enumerate(block.get("lines", [])):
+            line_id = (block["number"], line_no)
+            for span in line["spans"]:
+                if span["text"].strip():
+                    starts.append((round(span["bbox"][0] / tolerance), line_id))
+    if not starts:
+        return 0
+    bins = Counter(x for x, _ in set(starts))
+    counts = np.fromiter(bins.values(), dtype=np.int32)
+    # Every line has a left margin; only count columns beyond the most common start
+    return max(0, int((counts >= min_rows).sum()) - 1)
+
+
+def ruling_count(plumber_page) -> int:
+    """Ruling lines plus rectangles drawn on a pdfplumber page."""
+    return len(plumber_page.lines) + len(plumber_page.rects)
+
+
+def likely_table(features: Dict[str, float], min_words: int = MIN_WORDS, min_table_lines: int = MIN_TABLE_LINES,
+                 min_digit_density: float = 0.08, dense_digits: float = 0.2, min_columns: int = 3,
+                 min_rulings: int = 12) -> bool:
+    """
+    True if the signals suggest a table worth an LLM call.
+
+    Requires enough words and table-like lines (logoplay.MIN_WORDS and
+    MIN_TABLE_LINES, the should_skip_page thresholds), then either markdown table
+    rows, very dense digits, or two of: digit density, aligned columns, ruling
+    lines. A single weak signal is common on prose pages (a header rule, a few
+    numbers), so it is not enough; for bare text (no layout signals) digit
+    density alone decides.
+    """
+    if features["word_count"] < min_words or features["tableish_lines"] < min_table_lines:
+        return False
+    if features.get("pipe_lines", 0) >= min_table_lines or features["digit_density"] >= dense_digits:
+        return True
+    if "aligned_columns" not in features and "rulings" not in features:
+        return features["digit_density"] >= min_digit_density
+    signals = (features["digit_density"] >= min_digit_density,
+               features.get("aligned_columns", 0) >= min_columns,
+               features.get("rulings", 0) >= min_rulings)
+    return sum(signals) >= 2
+
+
+def _count(forwarded: Sequence[bool], what: str) -> List[bool]:
+    GATE_STATS["forwarded"] += sum(forwarded)
+    GATE_STATS["skipped"] += len(forwarded) - sum(forwarded)
+    logging.info(f"Table gate: forwarded {sum(forwarded)} of {len(forwarded)} {what} to the LLM.")
+    return list(forwarded)
+
+
+def gate_texts(texts: Sequence[str], **thresholds) -> List[bool]:
+    """Per text (page or chunk content): True to forward it to the LLM."""
+    return _count([likely_table(text_features(text), **thresholds) for text in texts], "texts")
+
+
+def page_features(session: PdfSession, page_no: int, plumber_page=None) -> Dict[str, float]:
+    """text_features of a 0-based page plus aligned columns and, given its pdfplumber page, ruling counts."""
+    features = text_features(session.page_text(page_no))
+    features["aligned_columns"] = aligned_columns(session, page_no)
+    if plumber_page is not None:
+        features["rulings"] = ruling_count(plumber_page)
+    return features
+
+
+def gate_pages(pdf_path, page_numbers: Sequence[int], use_rulings: bool = True,
+               table_pages: Iterable[int] = (), **thresholds) -> List[int]:
+    """
+    Filters 1-based page numbers down to those likely to hold a table.
+
+    Pages where pdfplumber already extracted a table are forwarded without
+    scoring; only the rest are gated.
+
+    Parameters:
+    - pdf_path (str | PdfSession): Path to the PDF file, or an open session
+    - page_numbers (Sequence[int]): Candidate pages (1-based)
+    - use_rulings (bool): Also count pdfplumber lines/rects (opens the PDF with pdfplumber once)
+    - table_pages (Iterable[int]): Pages (1-based) with extracted tables
+
+    Returns:
+    - List[int]: The forwarded pages, in input order
+    """
+    known = set(table_pages)
+    to_score = [page_no for page_no in page_numbers if page_no not in known]
+    GATE_STATS["known_table"] += len(page_numbers) - len(to_score)
+
+    scores: Dict[int, bool] = {}
+    if to_score:
+        with open_session(pdf_path) as session:
+            plumber: Optional[pdfplumber.PDF] = pdfplumber.open(session.pdf_path) if use_rulings else None
+            try:
+                for page_no in to_score:
+                    plumber_page = plumber.pages[page_no - 1] if plumber is not None else None
+                    scores[page_no] = likely_table(page_features(session, page_no - 1, plumber_page), **thresholds)
+            finally:
+                if plumber is not None:
+                    plumber.close()
+        _count(list(scores.values()), "pages without extracted tables")
+    return [page_no for page_no in page_numbers if page_no in known or scores[page_no]]
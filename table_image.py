@@ -1,4 +1,6 @@
 import pdfplumber
+from parallel_pages import map_page_shards
+
 def normalize_headers(headers):
     """
     Normalize table headers by handling multiline headers and combining year mentions.
@@ -12,20 +14,16 @@ def normalize_headers(headers):
             normalized_headers.append(header.strip())
     return normalized_headers
 
-def extract_tables_from_file(file_name):
+def _extract_page_shard(file_name, page_numbers):
     """
-    Extract tables from a PDF file with specific handling for year mentions and multiline headers.
-
-    Args:
-        file_name (str): Path to the PDF file.
-
-    Returns:
-        list: A list of dictionaries containing table metadata and data.
+    Pool worker: extract_tables() per page with normalized headers (Column_n when
+    all blank), titled from the page's top 50pt band.
     """
     all_tables = []
 
     with pdfplumber.open(file_name) as pdf:
-        for page_no, page in enumerate(pdf.pages):
+        for page_no in page_numbers:
+            page = pdf.pages[page_no]
             # Extract potential table blocks
             tables = page.extract_tables()
 
@@ -61,4 +59,22 @@ def extract_tables_from_file(file_name):
                     }
                     all_tables.append(table_info)
 
+            page.flush_cache()  # Keep memory flat on long documents
+
     return all_tables
+
+def extract_tables_from_file(file_name, workers=None):
+    """
+    Extract tables from a PDF file with specific handling for year mentions and multiline headers.
+
+    Args:
+        file_name (str): Path to the PDF file.
+        workers (int): Pages are split across this many worker processes (default: serial).
+
+    Returns:
+        list: A list of dictionaries containing table metadata and data, in page/table order.
+    """
+    with pdfplumber.open(file_name) as pdf:
+        page_numbers = list(range(len(pdf.pages)))
+
+    return map_page_shards(file_name, page_numbers, _extract_page_shard, workers or 1)
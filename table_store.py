@@ -0,0 +1,213 @@
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pdf_session import PdfSession
+from section_index import SectionIndex
+from table_extract import extract_tables_from_file
+from table_image import normalize_headers
+
+# "1,234.5", "(317)", "-0.4%", "$7.99", "11.0x", "€1.2bn"
+_NUMBER = re.compile(
+    r"^(?P<neg>\()?(?P<sign>[-–])?(?P<cur>[$€£¥])?(?P<sign2>[-–])?(?P<num>\d[\d,]*(?:\.\d+)?|\.\d+)"
+    r"(?P<suffix>%|x|bn|mm|[kmb])?(?P<close>\))?$",
+    re.IGNORECASE,
+)
+_MISSING = {"-", "–", "—", "na", "n/a", "nm", "n.m.", "--"}
+
+# Column headers that name a period: 2016, 2016E, FY16, CY2016, 1Q15, 3Q16E, Sep-14, 2014-15
+_PERIOD = re.compile(
+    r"^(?:(?P<fy>FY|CY)'?(?P<fy_year>\d{4}|\d{2})|(?P<year>(?:19|20)\d{2})(?:[-/](?:\d{2}))?|"
+    r"[1-4]Q'?(?P<q_year>\d{4}|\d{2})|(?:H[12]|[1-4]H)'?(?P<h_year>\d{2}|\d{4})|"
+    r"[A-Za-z]{3}-(?P<m_year>\d{2}))[AEFPB]?$",
+    re.IGNORECASE,
+)
+
+COLUMNS = ["company", "section", "page", "table", "title", "metric", "column", "year", "value", "unit", "raw"]
+
+
+def parse_value(token: str) -> Tuple[float, str]:
+    """
+    Parses one table cell token.
+
+    Returns:
+    - (value, unit): value as float (NaN if not numeric; parenthesized numbers are
+      negative), unit is "%", "x", a currency symbol and/or a scale suffix ("$bn"), or ""
+    """
+    token = token.strip()
+    if token.lower() in _MISSING:
+        return math.nan, ""
+    match = _NUMBER.match(token)
+    if not match or bool(match.group("neg")) != bool(match.group("close")):
+        return math.nan, ""
+    value = float(match.group("num").replace(",", ""))
+    if match.group("neg") or match.group("sign") or match.group("sign2"):
+        value = -value
+    unit = (match.group("cur") or "") + (match.group("suffix") or "").lower()
+    return value, unit
+
+
+def _is_value_token(token: str) -> bool:
+    return token.lower() in _MISSING or not math.isnan(parse_value(token)[0])
+
+
+def header_year(header: str) -> Optional[int]:
+    """Year named by a period header ("2016E", "FY16", "3Q15", "Sep-14"), or None."""
+    match = _PERIOD.match(header.strip())
+    if not match:
+        return None
+    year = next(g for g in (match.group("fy_year"), match.group("year"), match.group("q_year"),
+                            match.group("h_year"), match.group("m_year")) if g)
+    year = int(year)
+    return year + 2000 if year < 100 else year
+
+
+def split_line(line: str) -> Tuple[str, List[str]]:
+    """Splits "Total Revenue 7,887 8,087 (317)" into ("Total Revenue", ["7,887", "8,087", "(317)"])."""
+    tokens = line.split()
+    cut = len(tokens)
+    while cut > 0 and _is_value_token(tokens[cut - 1]):
+        cut -= 1
+    return " ".join(tokens[:cut]), tokens[cut:]
+
+
+def column_names(header: str, n: int) -> List[str]:
+    """
+    Names for n values found under one extracted column. A cell often holds a
+    whole collapsed row, so the header line whose last n tokens are all periods
+    ("Fiscal 1Q15 2Q15 3Q15 4Q15") supplies the names; otherwise the header is
+    used as is (n == 1) or numbered.
+    """
+    for header_line in header.splitlines():
+        tokens = header_line.split()
+        if len(tokens) >= n and all(header_year(t) for t in tokens[len(tokens) - n:]):
+            return tokens[len(tokens) - n:]
+    label = " ".join(header.split())
+    return [label] if n == 1 else [f"{label} [{i + 1}]" for i in range(n)]
+
+
+def table_facts(table: Dict) -> Iterable[Tuple[str, str, float, str, str]]:
+    """
+    Yields (metric, column, value, unit, raw) for every numeric cell of one
+    extracted table ({"data": [row dicts], ...} as from extract_tables_from_file).
+
+    The row label is the text part of the first column's line at the same
+    position, or the text in front of the values when a line holds a collapsed row.
+    """
+    rows = table.get("data") or []
+    if not rows:
+        return
+    keys = list(rows[0].keys())
+    headers = normalize_headers([key if isinstance(key, str) else None for key in keys])
+
+    for row in rows:
+        cells = [str(row.get(key, "") or "") for key in keys]
+        first_lines = cells[0].splitlines() if cells else []
+        row_labels = [split_line(line)[0] for line in first_lines]
+        for col, (header, cell) in enumerate(zip(headers, cells)):
+            for line_no, line in enumerate(cell.splitlines()):
+                label, tokens = split_line(line)
+                if not tokens:
+                    continue
+                if not label:
+                    label = row_labels[line_no] if line_no < len(row_labels) else ""
+                    if col == 0 or not label:
+                        continue
+                for name, token in zip(column_names(header, len(tokens)), tokens):
+                    value, unit = parse_value(token)
+                    yield label, name, value, unit, token
+
+
+class TableStore:
+    """
+    Typed, columnar store of extracted table cells for numeric lookups.
+
+    Every numeric cell becomes one row of a pandas DataFrame (company, section,
+    page, table, title, metric, column, year, value, unit, raw), with values parsed
+    to floats (percentages, currency, multiples, parenthesized negatives) and
+    period headers mapped to years, so "price target 2016" is a filter instead of
+    a retrieval + generation round trip.
+    """
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None):
+        self.frame = frame if frame is not None else pd.DataFrame(columns=COLUMNS)
+        self._index()
+
+    def _index(self):
+        self.frame = self.frame.reset_index(drop=True)
+        self._metric_keys = self.frame["metric"].astype(str).str.lower().str.strip().to_numpy().astype(str)
+        self._column_keys = self.frame["column"].astype(str).str.lower().str.strip().to_numpy().astype(str)
+
+    def add_tables(self, tables: List[Dict], company: str = "", toc: Optional[List[List]] = None,
+                   num_pages: Optional[int] = None) -> "TableStore":
+        """
+        Adds tables from extract_tables_from_file. With a TOC, each cell is tagged
+        with the title of the section covering its page.
+        """
+        sections = SectionIndex(toc, num_pages or 0) if toc else None
+        records = []
+        for table in tables:
+            page = table.get("page_number")
+            section = sections.title_level_at(page)[0] if sections and page else ""
+            for metric, column, value, unit, raw in table_facts(table):
+                records.append((company, section, page, table.get("table_index"), table.get("title") or "",
+                                metric, column, header_year(column), value, unit, raw))
+        if records:
+            added = pd.DataFrame.from_records(records, columns=COLUMNS)
+            added["year"] = added["year"].astype("Int64")
+            added["value"] = added["value"].astype(np.float64)
+            frames = [self.frame, added] if len(self.frame) else [added]
+            self.frame = pd.concat(frames, ignore_index=True)
+            for name in ("company", "section", "title", "unit"):
+                self.frame[name] = self.frame[name].astype("category")
+            self._index()
+        return self
+
+    def lookup(self, metric: str, column: Optional[str] = None, year: Optional[int] = None,
+               company: Optional[str] = None, section: Optional[str] = None, exact: bool = False) -> pd.DataFrame:
+        """
+        Cells whose row label matches `metric` (case-insensitive substring, or equality
+        with exact=True), optionally narrowed by column header, year, company and
+        section (substring). Missing values (NA, -) are dropped; exact label matches
+        come first.
+        """
+        key = metric.lower().strip()
+        exact_mask = self._metric_keys == key
+        mask = exact_mask.copy() if exact else np.char.find(self._metric_keys, key) >= 0
+        frame = self.frame
+        if column is not None:
+            mask &= self._column_keys == column.lower().strip()
+        if year is not None:
+            mask &= (frame["year"] == year).fillna(False).to_numpy(dtype=bool)
+        if company is not None:
+            mask &= (frame["company"].astype(str) == company).to_numpy()
+        if section is not None:
+            mask &= frame["section"].astype(str).str.contains(section, case=False, regex=False).to_numpy()
+        mask &= frame["value"].notna().to_numpy()
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(~exact_mask[rows], kind="stable")]
+        return frame.iloc[rows]
+
+    def value(self, metric: str, **filters) -> Optional[float]:
+        """First matching value from lookup(), or None."""
+        hits = self.lookup(metric, **filters)
+        return float(hits["value"].iloc[0]) if len(hits) else None
+
+    def save(self, path: str):
+        self.frame.to_pickle(path)
+
+    @classmethod
+    def load(cls, path: str) -> "TableStore":
+        return cls(pd.read_pickle(path))
+
+
+def build_table_store(pdf_path: str, company: str = "", toc: Optional[List[List]] = None) -> TableStore:
+    """TableStore for one PDF, from the (layout-cached) pdfplumber tables."""
+    num_pages = None
+    if toc:
+        with PdfSession(pdf_path) as session:
+            num_pages = len(session)
+    return TableStore().add_tables(extract_tables_from_file(pdf_path), company, toc, num_pages)
@@ -0,0 +1,44 @@
+import pytest
+
+from date_scanner import find_date, iter_dates
+
+
+@pytest.mark.parametrize("text, iso", [
+    ("Published 23/04/2024", "2024-04-23"),
+    ("04/23/24", "2024-04-23"),
+    ("23.04.2024", "2024-04-23"),
+    ("2024-04-23", "2024-04-23"),
+    ("3rd August, 2025", "2025-08-03"),
+    ("April 23, 2024", "2024-04-23"),
+])
+def test_find_date_normalizes_to_iso(text, iso):
+    assert find_date(text).iso == iso
+
+
+@pytest.mark.parametrize("text", [
+    "Section 1.2.24",
+    "see figure 3.1.15",
+    "1/2-2024",
+    "Q1 2024",
+    "31/02/2024",
+    "April 2024",
+])
+def test_find_date_rejects_non_dates(text):
+    assert find_date(text) is None
+
+
+def test_month_year_is_opt_in():
+    assert find_date("April 2024", allow_month_year=True).iso == "2024-04"
+
+
+@pytest.mark.parametrize("text, date", [
+    ("Quarter ended March 2024. Published 5 April 2024", "5 April 2024"),
+    ("Results May 2024 outlook; April 23, 2024", "April 23, 2024"),
+])
+def test_reporting_period_is_not_the_date(text, date):
+    assert find_date(text).text == date
+
+
+def test_iter_dates_scans_left_to_right():
+    text = "Section 1.2.24 updated 5 May 2024, first issued 2023-11-02"
+    assert [match.iso for match in iter_dates(text)] == ["2024-05-05", "2023-11-02"]
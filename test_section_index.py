@@ -0,0 +1,29 @@
+from section_index import FRONT_MATTER, FRONT_MATTER_LEVEL, SectionIndex
+
+TOC = [[1, "Overview", 3], [2, "Earnings", 3], [1, "Valuation", 6], [1, "Disclosures", 9]]
+
+
+def test_title_level_at_covering_section():
+    sections = SectionIndex(TOC, 10)
+    assert sections.title_level_at(3) == ("Earnings", 2)  # deepest entry on a shared start page
+    assert sections.title_level_at(5) == ("Earnings", 2)
+    assert sections.title_level_at(6) == ("Valuation", 1)
+    assert sections.title_level_at(10) == ("Disclosures", 1)
+
+
+def test_pages_before_first_entry_are_front_matter():
+    sections = SectionIndex(TOC, 10)
+    assert sections.section_at(1) is None
+    assert sections.title_level_at(1) == (FRONT_MATTER, FRONT_MATTER_LEVEL)
+    assert sections.title_level_at(2) == (FRONT_MATTER, FRONT_MATTER_LEVEL)
+
+
+def test_empty_toc_is_all_front_matter():
+    assert SectionIndex([], 4).title_level_at(2) == (FRONT_MATTER, FRONT_MATTER_LEVEL)
+
+
+def test_page_count_and_range():
+    sections = SectionIndex(TOC, 10)
+    assert sections.page_count(0) == 3
+    assert sections.page_count(1) == 3
+    assert sections.page_range(3) == (9, 10)
@@ -0,0 +1,62 @@
+import logging
+import os
+from collections import Counter, OrderedDict
+from typing import Optional
+
+
+class KeyedTextCache:
+    """
+    Text results keyed by hex digests: an in-memory LRU in front of one file per
+    key on disk, sharded by the key's first two characters.
+
+    Parameters:
+    - directory (str): Root directory of the disk entries
+    - max_entries (int): Entries kept in memory (least recently used are evicted)
+    - what (str): Name used in log messages ("OCR", "LLM")
+    """
+
+    def __init__(self, directory: str, max_entries: int = 4096, what: str = "text"):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.what = what
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = Counter()  # memory_hit / disk_hit / miss
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached text (memory first, then disk), or None."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats["memory_hit"] += 1
+            return self._memory[key]
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                logging.warning(f"Ignoring unreadable {self.what} cache entry {path}", exc_info=True)
+            else:
+                self._remember(key, text)
+                self.stats["disk_hit"] += 1
+                return text
+        self.stats["miss"] += 1
+        return None
+
+    def put(self, key: str, text: str):
+        """Stores text in memory and on disk (atomic write)."""
+        self._remember(key, text)
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
@@ -0,0 +1,69 @@
+import logging
+import string
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+# Pages routed to OCR vs served from the PDF text layer, process-wide
+OCR_STATS = Counter()
+
+_PLAIN_CHARS = set(string.ascii_letters + string.digits + string.punctuation + string.whitespace + "•–—’‘“”€£¥%")
+
+
+def text_layer_quality(text: str) -> Dict[str, float]:
+    """
+    Scores a page's extracted text layer.
+
+    Returns:
+    - Dict: char_count (non-whitespace characters), glyph_coverage (share of characters
+      that map to a real glyph, i.e. not U+FFFD) and garbage_ratio (share of characters
+      outside letters/digits/common punctuation)
+    """
+    chars = [c for c in text if not c.isspace()]
+    if not chars:
+        return {"char_count": 0, "glyph_coverage": 0.0, "garbage_ratio": 1.0}
+    unmapped = sum(1 for c in chars if c == "\ufffd")
+    garbage = sum(1 for c in chars if c not in _PLAIN_CHARS and not c.isalnum())
+    return {
+        "char_count": len(chars),
+        "glyph_coverage": 1 - unmapped / len(chars),
+        "garbage_ratio": garbage / len(chars),
+    }
+
+
+def has_usable_text_layer(text: str, min_chars: int = 200, min_coverage: float = 0.95, max_garbage: float = 0.1) -> bool:
+    """True if the text layer is good enough to skip OCR."""
+    quality = text_layer_quality(text)
+    return (quality["char_count"] >= min_chars
+            and quality["glyph_coverage"] >= min_coverage
+            and quality["garbage_ratio"] <= max_garbage)
+
+
+def text_layer_or_ocr(text: str, ocr: Callable[[], str], **thresholds) -> str:
+    """
+    Returns the text layer when it passes has_usable_text_layer, otherwise ocr().
+    Updates OCR_STATS either way.
+    """
+    if has_usable_text_layer(text, **thresholds):
+        OCR_STATS["text_layer"] += 1
+        return text
+    OCR_STATS["ocr"] += 1
+    logging.info(f"Text layer unusable ({text_layer_quality(text)}), falling back to OCR.")
+    return ocr()
+
+
+def route_pages(texts: Dict[int, str], **thresholds) -> Tuple[Dict[int, str], List[int]]:
+    """
+    Batch form of text_layer_or_ocr for pages whose OCR is run as one batch.
+
+    Parameters:
+    - texts (Dict[int, str]): page_no -> extracted text layer
+
+    Returns:
+    - (usable, needs_ocr): page_no -> text for pages served from the text layer,
+      and the page numbers that still need OCR
+    """
+    usable = {p: text for p, text in texts.items() if has_usable_text_layer(text, **thresholds)}
+    needs_ocr = [p for p in texts if p not in usable]
+    OCR_STATS["text_layer"] += len(usable)
+    OCR_STATS["ocr"] += len(needs_ocr)
+    return usable, needs_ocr
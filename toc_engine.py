@@ -0,0 +1,198 @@
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Union
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+import ocr_pool
+from link_index import get_link_index
+from pdf_session import PdfSession, open_session
+
+# "Hulu Overview ........ 4" -> ("Hulu Overview", 4)
+_LEADER_PAGE = re.compile(r"^(.*?)(?:\s*\.{2,}\s*(\d{1,4})|\s+(\d{1,3}))$")
+_NUMBERED = re.compile(r"^\d+\.\s*")
+_SUB_ITEM = re.compile(r"^([ivxlc]+\.|[a-zA-Z][\.\)])\s*", re.IGNORECASE)
+_BULLETS = ("• ", "- ")
+
+
+def find_toc_page(session: PdfSession, max_pages: int = 3) -> int:
+    """Among the first `max_pages` pages, the one with the most links (0 if none)."""
+    return get_link_index(session).toc_page(max_pages)
+
+
+def link_target_pages(session: PdfSession, page_no: int) -> List[int]:
+    """1-based target pages of a page's internal links, in link order."""
+    return get_link_index(session).targets_from(page_no, one_based=True)
+
+
+def _split_leader(text: str):
+    match = _LEADER_PAGE.match(text)
+    if match and match.group(1).strip():
+        return match.group(1).strip(" ."), int(match.group(2) or match.group(3))
+    return text.strip(" ."), None
+
+
+def parse_toc_text(text: str) -> List[List]:
+    """
+    Parses TOC text into [[level, title, page_or_None], ...].
+
+    Understands numbered ("1."), roman ("i."), lettered ("a)", "b.") and bullet
+    ("• " / "- ", first marker seen is level 1) entries, broken-line numbering and
+    dot-leader page numbers.
+    """
+    match = re.search(r"Table of Contents(.*)", text, re.DOTALL | re.IGNORECASE)
+    if match:
+        text = match.group(1)
+    # Merge broken lines (e.g., "1.\nTitle" -> "1. Title", "•\nTitle" -> "• Title")
+    text = re.sub(r"(\d+\.|[ivxlc]+\.|[a-zA-Z][\.\)]|[•\-])\n", r"\1 ", text, flags=re.IGNORECASE)
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+
+    level1_bullet = next((line[:2] for line in lines if line.startswith(_BULLETS)), None)
+
+    toc_list = []
+    for line in lines:
+        if _NUMBERED.match(line):
+            level, name = 1, _NUMBERED.sub("", line, count=1)
+        elif _SUB_ITEM.match(line):
+            level, name = 2, _SUB_ITEM.sub("", line, count=1)
+        elif level1_bullet and line.startswith(_BULLETS):
+            level, name = (1 if line.startswith(level1_bullet) else 2), line[2:]
+        else:
+            continue
+        name = re.sub(r"\d{4}\.\d{2}\.\d{2}\s–", "", name)  # Remove dates
+        name, page = _split_leader(name)
+        if name:
+            toc_list.append([level, name, page])
+    return toc_list
+
+
+def assign_link_pages(toc_list: List[List], page_numbers: List[int]) -> List[List]:
+    """
+    Fills missing pages from link targets in order; the first level-2 entry under a
+    level-1 entry inherits its parent's page.
+    """
+    page_index = 0
+    for i in range(len(toc_list)):
+        if toc_list[i][2] is not None:
+            continue
+        if toc_list[i][0] == 1:
+            if page_index < len(page_numbers):
+                toc_list[i][2] = page_numbers[page_index]
+                page_index += 1
+            if i + 1 < len(toc_list) and toc_list[i + 1][0] == 2 and toc_list[i + 1][2] is None:
+                toc_list[i + 1][2] = toc_list[i][2]
+        elif page_index < len(page_numbers):
+            toc_list[i][2] = page_numbers[page_index]
+            page_index += 1
+    return toc_list
+
+
+def plausible_toc(toc_list: List[List], num_pages: int, min_entries: int = 2) -> bool:
+    """
+    Sanity check for TOCs parsed from page text: at least `min_entries` entries,
+    every page inside 1..num_pages and pages never going backwards.
+    """
+    if len(toc_list) < min_entries:
+        return False
+    pages = [entry[2] for entry in toc_list]
+    if any(page is None or not 1 <= page <= num_pages for page in pages):
+        return False
+    return all(a <= b for a, b in zip(pages, pages[1:]))
+
+
+# --- strategies: each returns a TOC list, or [] when it cannot produce a confident one ---
+
+def toc_from_outline(session: PdfSession) -> List[List]:
+    """Embedded PDF outline (bookmarks)."""
+    return [[level, title.strip(), page] for level, title, page in session.doc.get_toc() if page > 0]
+
+
+def toc_from_links(session: PdfSession) -> List[List]:
+    """Link-target mapping: each TOC-page link's own text is the entry title, its indent the level."""
+    toc_page = find_toc_page(session)
+    page = session.page(toc_page)
+    links = [link for link in session.page_links(toc_page) if "page" in link]
+    if not links:
+        return []
+    left = min(link["from"].x0 for link in links)
+    toc_list, last_y1 = [], 0.0
+    for link in sorted(links, key=lambda l: (l["from"].y0, l["from"].x0)):
+        rect = link["from"]
+        # Read only the link's middle band so wrapped neighbours don't bleed in
+        band = fitz.Rect(rect.x0, rect.y0 + rect.height * 0.3, rect.x1, rect.y1 - rect.height * 0.3)
+        text = " ".join(page.get_textbox(band).split())
+        title, _ = _split_leader(re.split(r"\.{3,}", text)[0])
+        title = _SUB_ITEM.sub("", _NUMBERED.sub("", title, count=1), count=1).strip()
+        if not title or title.isdigit():
+            continue
+        level, target = (1 if rect.x0 - left < 10 else 2), int(link["page"]) + 1
+        if toc_list and toc_list[-1][0] == level and toc_list[-1][2] == target and rect.y0 - last_y1 < rect.height:
+            toc_list[-1][1] += f" {title}"  # entry wrapped onto a second link line
+        else:
+            toc_list.append([level, title, target])
+        last_y1 = rect.y1
+    return toc_list if plausible_toc(toc_list, len(session)) else []
+
+
+def toc_from_text(session: PdfSession) -> List[List]:
+    """Regex parse of the TOC page's text layer, pages from dot leaders or links."""
+    toc_page = find_toc_page(session)
+    toc_list = parse_toc_text(session.page_text(toc_page))
+    toc_list = assign_link_pages(toc_list, link_target_pages(session, toc_page))
+    return toc_list if plausible_toc(toc_list, len(session)) else []
+
+
+def toc_from_ocr(session: PdfSession) -> List[List]:
+    """OCR of the TOC page's left column (slowest; for scanned TOCs)."""
+    toc_page = find_toc_page(session)
+    pix = session.page(toc_page).get_pixmap()
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    left_column = img.crop((0, 0, img.width // 2, img.height))
+    ocr_text = ocr_pool.ocr_images([left_column], workers=1, dpi=72)[0]
+    toc_list = assign_link_pages(parse_toc_text(ocr_text), link_target_pages(session, toc_page))
+    # OCR of a cover page can yield a couple of garbage "entries"; demand a real TOC
+    return toc_list if plausible_toc(toc_list, len(session), min_entries=3) else []
+
+
+STRATEGIES: List[tuple] = [
+    ("outline", toc_from_outline),
+    ("links", toc_from_links),
+    ("text", toc_from_text),
+    ("ocr", toc_from_ocr),
+]
+
+
+def extract_toc(pdf_path: Union[str, PdfSession], strategies: Optional[List[tuple]] = None) -> Dict:
+    """
+    Extracts the TOC with the cheapest strategy that yields a confident result:
+    embedded outline, then link-target mapping, then regex text parsing, then OCR.
+
+    Parameters:
+    - pdf_path (str | PdfSession): Path to the PDF file, or an open session
+    - strategies (List[tuple]): Optional [(name, fn(session) -> toc_list), ...] override
+
+    Returns:
+    - Dict: {"toc": [[level, title, page], ...], "strategy": winning name or None,
+             "timings": {name: seconds} for every strategy tried}
+    """
+    with open_session(pdf_path) as session:
+        timings = {}
+        for name, strategy in strategies or STRATEGIES:
+            start = time.perf_counter()
+            try:
+                toc_list = strategy(session)
+            except Exception:
+                logging.warning(f"TOC strategy '{name}' failed", exc_info=True)
+                toc_list = []
+            timings[name] = time.perf_counter() - start
+            if toc_list:
+                logging.info(f"TOC from '{name}' ({len(toc_list)} entries); timings: {timings}")
+                return {"toc": toc_list, "strategy": name, "timings": timings}
+        return {"toc": [], "strategy": None, "timings": timings}
+
+
+def extract_toc_from_pdf(pdf_path: Union[str, PdfSession]) -> List[List]:
+    """Drop-in replacement for the per-script extract_toc_from_pdf variants."""
+    return extract_toc(pdf_path)["toc"]
@@ -2,6 +2,8 @@ from langchain.document_loaders import UnstructuredFileLoader
 from transformers import pipeline
 from sentence_transformers import SentenceTransformer
 import re
+import llm_batch
+import table_gate
 
 # === Settings ===
 llm = pipeline("text-generation", model="meta-llama/Meta-Llama-3-8B-Instruct", device=0)  # Or your model
@@ -10,8 +12,10 @@ rs = []  # Final result block list
 
 # === Helper Functions ===
 
-def extract_table_with_llm(text: str) -> str:
-    prompt = f"""
+TABLE_PROMPT_VERSION = "usage-table-v1"
+
+def table_prompt(text: str) -> str:
+    return f"""
 The following text was extracted from a financial document page. If any part of it looks like a table (even if broken), reconstruct it into a clean markdown table. If no table exists, reply with: No table found.
 
 Text:
@@ -19,8 +23,16 @@ Text:
 
 Reconstructed Table (if any):
 """
-    result = llm(prompt, max_new_tokens=512, do_sample=False)[0]["generated_text"]
-    return result.split("Reconstructed Table (if any):")[-1].strip()
+
+def extract_table_with_llm(text: str) -> str:
+    return extract_tables_with_llm([text])[0]
+
+def extract_tables_with_llm(texts: list, batch_size: int = 8, concurrency: int = 1) -> list:
+    """Batched extract_table_with_llm: one reconstructed table (or "No table found.") per text, in order."""
+    results = llm_batch.generate_batch(llm, [table_prompt(text) for text in texts], batch_size=batch_size,
+                                       concurrency=concurrency, template_version=TABLE_PROMPT_VERSION,
+                                       max_new_tokens=512, do_sample=False)
+    return [result.split("Reconstructed Table (if any):")[-1].strip() for result in results]
 
 def is_valid_table(llm_output: str) -> bool:
     return ("|" in llm_output and "---" in llm_output) or bool(re.search(r"\bYear\b.*\d{4}", llm_output))
@@ -52,13 +64,17 @@ def flatten_table_to_text(table_data: list) -> str:
 
 # === Main Pipeline ===
 
-def extract_llm_tables_to_rs(file_name: str):
+def extract_llm_tables_to_rs(file_name: str, batch_size: int = 8, concurrency: int = 1, use_gate: bool = True):
     loader = UnstructuredFileLoader(file_name)
     docs = loader.load()
 
-    for idx, doc in enumerate(docs):
+    # Only pages that look like they hold a table go to the LLM
+    forward = table_gate.gate_texts([doc.page_content for doc in docs]) if use_gate else [True] * len(docs)
+    candidates = [(idx, doc) for idx, doc in enumerate(docs) if forward[idx]]
+    llm_outputs = extract_tables_with_llm([doc.page_content for _, doc in candidates], batch_size, concurrency)
+
+    for (idx, doc), llm_output in zip(candidates, llm_outputs):
         page_num = doc.metadata.get("page", idx + 1)
-        llm_output = extract_table_with_llm(doc.page_content)
 
         if is_valid_table(llm_output):
             try:
@@ -0,0 +1,140 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+from typing import Any, Callable, Dict, List, Optional
+
+from layout_cache import file_sha256
+
+# Bump whenever chunking/ingest changes what goes into an index; old entries are then ignored.
+INDEX_VERSION = 1
+
+# index.pkl / docstore entries are pickles: CACHE_DIR must be a trusted, private directory.
+CACHE_DIR = os.environ.get(
+    "RESEA_VECTOR_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "resea", "vectors"),
+)
+
+
+def embedding_model_name(embed_model: Any) -> str:
+    """Model name of a HuggingFaceEmbeddings-like object (falls back to its class name)."""
+    for attr in ("model_name", "model_id", "model"):
+        if isinstance(getattr(embed_model, attr, None), str):
+            return getattr(embed_model, attr)
+    return f"{type(embed_model).__module__}.{type(embed_model).__qualname__}"
+
+
+def index_key(source_path: str, embed_model: Any, params: Optional[Dict] = None) -> str:
+    """
+    Cache key for the vector index of one source file: its content hash, the
+    embedding model, the ingest parameters (chunk size, overlap, ...) and INDEX_VERSION.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"source={file_sha256(source_path)}|model={embedding_model_name(embed_model)}|".encode())
+    digest.update(f"version={INDEX_VERSION}|".encode())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _index_dir(kind: str, key: str, cache_dir: Optional[str]) -> str:
+    return os.path.join(cache_dir or CACHE_DIR, kind, key)
+
+
+def _publish(build_dir: str, final_dir: str):
+    # Rename the fully written directory into place, so readers never see a partial index
+    try:
+        os.replace(build_dir, final_dir)
+    except OSError:
+        # Another process published the same index first
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def _load_faiss(index_dir: str, embed_model: Any):
+    from langchain.vectorstores import FAISS
+
+    # load_local wires the embeddings the way the installed langchain release expects;
+    # newer releases refuse to unpickle index.pkl unless told the source is trusted
+    kwargs = {}
+    if "allow_dangerous_deserialization" in inspect.signature(FAISS.load_local).parameters:
+        kwargs["allow_dangerous_deserialization"] = True
+    return FAISS.load_local(index_dir, embed_model, **kwargs)
+
+
+def load_or_build_faiss(source_path: str, build_documents: Callable[[], List], embed_model: Any,
+                        params: Optional[Dict] = None, use_cache: bool = True, cache_dir: Optional[str] = None):
+    """
+    LangChain FAISS vector store for one source file, embedded once and reused.
+
+    On a miss the documents are built, embedded and the index saved with
+    save_local (index.faiss + index.pkl); later runs on the same content and
+    embedding model load it with FAISS.load_local instead of re-embedding.
+
+    Parameters:
+    - source_path (str): File the documents come from (its content hash keys the index)
+    - build_documents (Callable): Loads and splits the documents; only called on a miss
+    - embed_model: LangChain embeddings (e.g. HuggingFaceEmbeddings)
+    - params (Dict): Ingest parameters that change the documents (chunk_size, chunk_overlap, ...)
+
+    Returns:
+    - FAISS: The vector store
+    """
+    from langchain.vectorstores import FAISS
+
+    if not use_cache:
+        return FAISS.from_documents(build_documents(), embed_model)
+
+    index_dir = _index_dir("faiss", index_key(source_path, embed_model, params), cache_dir)
+    if os.path.exists(os.path.join(index_dir, "index.faiss")):
+        try:
+            return _load_faiss(index_dir, embed_model)
+        except Exception:
+            logging.warning(f"Ignoring unreadable vector index {index_dir}", exc_info=True)
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+    vector_store = FAISS.from_documents(build_documents(), embed_model)
+    build_dir = f"{index_dir}.{os.getpid()}.tmp"
+    vector_store.save_local(build_dir)
+    _publish(build_dir, index_dir)
+    logging.info(f"Saved vector index for {source_path} to {index_dir}")
+    return vector_store
+
+
+def load_or_build_llama_index(source_path: str, build_documents: Callable[[], List], service_context: Any,
+                              embed_model: Any, params: Optional[Dict] = None, use_cache: bool = True,
+                              cache_dir: Optional[str] = None):
+    """
+    llama_index VectorStoreIndex for one source file, persisted with its
+    StorageContext and reloaded with load_index_from_storage on later runs.
+
+    Parameters:
+    - source_path (str): File the documents come from (its content hash keys the index)
+    - build_documents (Callable): Loads the documents; only called on a miss
+    - service_context: ServiceContext used to build (and query) the index
+    - embed_model: The service context's embedding model (part of the key)
+    - params (Dict): Ingest parameters that change the index (chunk_size, ...)
+
+    Returns:
+    - VectorStoreIndex: The index
+    """
+    from llama_index import StorageContext, VectorStoreIndex, load_index_from_storage
+
+    if not use_cache:
+        return VectorStoreIndex.from_documents(build_documents(), service_context=service_context)
+
+    index_dir = _index_dir("llama_index", index_key(source_path, embed_model, params), cache_dir)
+    if os.path.isdir(index_dir):
+        try:
+            storage_context = StorageContext.from_defaults(persist_dir=index_dir)
+            return load_index_from_storage(storage_context, service_context=service_context)
+        except Exception:
+            logging.warning(f"Ignoring unreadable vector index {index_dir}", exc_info=True)
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+    index = VectorStoreIndex.from_documents(build_documents(), service_context=service_context)
+    build_dir = f"{index_dir}.{os.getpid()}.tmp"
+    index.storage_context.persist(persist_dir=build_dir)
+    _publish(build_dir, index_dir)
+    logging.info(f"Saved vector index for {source_path} to {index_dir}")
+    return index
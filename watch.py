@@ -1,23 +1,37 @@
-def extract_llm_tables_as_json(split_docs, llm_pipeline, temperature=0.7):
+import llm_batch
+import table_gate
+
+TABLE_PROMPT_VERSION = "watch-table-v1"
+
+def extract_llm_tables_as_json(split_docs, llm_pipeline, temperature=0.7, batch_size=8, concurrency=1, use_gate=True):
     tables = []
-    for idx, chunk in enumerate(split_docs):
-        page_num = chunk.metadata.get("page", idx + 1)
-        prompt = f"""
+
+    # Only chunks that look like they hold a table go to the LLM
+    forward = table_gate.gate_texts([chunk.page_content for chunk in split_docs]) if use_gate else [True] * len(split_docs)
+    candidates = [(idx, chunk) for idx, chunk in enumerate(split_docs) if forward[idx]]
+    prompts = [f"""
 The following text was extracted from a financial document. If any part of it looks like a table (even if broken), reconstruct it into a clean markdown table. If no table exists, reply with: No table found.
 
 Text:
 {chunk.page_content}
-"""
+""" for _, chunk in candidates]
 
-        response = llm_pipeline(
-            prompt,
-            temperature=temperature,
-            max_new_tokens=512,
-            do_sample=False,
-            return_full_text=False
-        )
+    # All chunks go to the pipeline in batches; outputs come back in chunk order
+    responses = llm_batch.generate_batch(
+        llm_pipeline,
+        prompts,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        template_version=TABLE_PROMPT_VERSION,
+        temperature=temperature,
+        max_new_tokens=512,
+        do_sample=False,
+        return_full_text=False
+    )
 
-        llm_output = response[0]["generated_text"].strip()
+    for (idx, chunk), response in zip(candidates, responses):
+        page_num = chunk.metadata.get("page", idx + 1)
+        llm_output = response.strip()
         if is_valid_table(llm_output):
             try:
                 parsed = parse_markdown_table(llm_output)